@@ -39,6 +39,18 @@ class Config:
     EMBEDDING_MODEL = os.getenv("EMBEDDING_MODEL", "qwen3-embedding:8b")  # Multilingual embeddings (Korean + English)
     CONVERSATIONAL_MODEL = os.getenv("CONVERSATIONAL_MODEL", "qwen2.5:7b")  # Better reading comprehension for Pi deployment
     
+    # Persistent embedding cache (SQLite file); empty disables it
+    # e.g., "data/embedding_cache.db" to reuse embeddings of repeated texts across runs
+    EMBEDDING_CACHE_PATH = os.getenv("EMBEDDING_CACHE_PATH", "")
+    
+    # Vision extraction cache directory (keyed by image content); empty disables it
+    # e.g., "data/vision_cache" so reprocessing unchanged images skips the vision model
+    VISION_CACHE_DIR = os.getenv("VISION_CACHE_DIR", "")
+    
+    # Images processed concurrently during folder processing (1 = sequential)
+    # Raise together with Ollama's OLLAMA_NUM_PARALLEL so vision requests actually overlap
+    IMAGE_PROCESSING_WORKERS = max(1, int(os.getenv("IMAGE_PROCESSING_WORKERS", "1")))
+    
     # FAISS mode for Pi (no embedding model needed)
     USE_FAISS = os.getenv("USE_FAISS", "false").lower() == "true"
     FAISS_INDEX_PATH = os.getenv("FAISS_INDEX_PATH", "data/faiss_index")
@@ -8,11 +8,13 @@ Implements progress tracking and error handling for document processing.
 import logging
 import os
 import hashlib
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import Dict, List, Tuple, Set
+from typing import Dict, List, Optional, Tuple, Set
 from dataclasses import dataclass
 from PIL import Image
 
+from backend.config import Config
 from backend.folder_manager import FolderManager
 from backend.processing_state import ProcessingStateManager
 from backend.text_processor import extract_from_pdf, extract_from_txt, chunk_text
@@ -193,8 +195,8 @@ class DocumentProcessor:
                     error_msg = result[7:]  # Remove "failed:" prefix
                     failed_files.append((file_path, error_msg))
             
-            for file_path in image_files:
-                result = self._process_image_file(file_path, folder.id, folder.user_id)
+            image_results = self._process_image_files(image_files, folder.id, folder.user_id)
+            for file_path, result in zip(image_files, image_results):
                 if result == "processed":
                     processed_count += 1
                     processed_files.append(file_path)
@@ -408,7 +410,7 @@ class DocumentProcessor:
                             new_height = max_dimension
                             new_width = int(width * (max_dimension / height))
                         logger.debug(f"Resizing page {page_num} from {width}x{height} to {new_width}x{new_height}")
-                        image = image.resize((new_width, new_height), Image.Resampling.LANCZOS)
+                        image = image.resize((new_width, new_height), Image.Resampling.LANCZOS, reducing_gap=3.0)
                     
                     # Save image to temporary file as JPEG (more reliable for vision models)
                     # JPEG doesn't support alpha channels and has simpler format
@@ -465,6 +467,33 @@ class DocumentProcessor:
             logger.error(f"Failed to process PDF pages with vision: {e}")
             return []
     
+    def _process_image_files(self, image_files: List[str], folder_id: int, user_id: int) -> List[str]:
+        """
+        Process several image files, overlapping vision model calls if configured.
+        
+        Each image spends most of its time waiting on the vision model, so with
+        Config.IMAGE_PROCESSING_WORKERS > 1 several images are sent to Ollama at
+        once (it serves up to OLLAMA_NUM_PARALLEL requests concurrently).
+        
+        Args:
+            image_files: Paths of image files to process
+            folder_id: ID of folder containing the files
+            user_id: User ID to tag the documents with
+            
+        Returns:
+            Results of _process_image_file, in the same order as image_files
+        """
+        workers = min(Config.IMAGE_PROCESSING_WORKERS, len(image_files))
+        if workers <= 1:
+            return [self._process_image_file(file_path, folder_id, user_id) for file_path in image_files]
+        
+        logger.info(f"Processing {len(image_files)} images with {workers} workers")
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            return list(executor.map(
+                lambda file_path: self._process_image_file(file_path, folder_id, user_id),
+                image_files
+            ))
+    
     def _process_image_file(self, file_path: str, folder_id: int, user_id: int) -> str:
         """
         Process an image file with vision model.
@@ -510,42 +539,19 @@ class DocumentProcessor:
                 else:
                     return f"failed:{error_msg}"
             
-            # Format as structured text
-            formatted_text = extraction.format_as_text()
+            try:
+                chunk = self._build_image_chunk(extraction, file_path, user_id)
+            except ValueError as e:
+                logger.error(f"Failed to process {file_path}: {e}")
+                return f"failed:{e}"
             
-            if not formatted_text.strip():
+            if chunk is None:
                 logger.warning(f"No content extracted from {file_path}")
                 return "skipped"
             
-            # Create document chunk with metadata
-            path = Path(file_path)
-            metadata = {
-                'user_id': user_id,  # Tag with user ID
-                'filename': path.name,
-                'folder_path': str(path.parent),
-                'file_type': 'image',
-                'chunk_index': 0
-            }
-            
-            # Add all flexible metadata fields dynamically
-            if extraction.flexible_metadata:
-                for key, value in extraction.flexible_metadata.items():
-                    metadata[key] = value
-                logger.info(f"Added {len(extraction.flexible_metadata)} flexible metadata fields to chunk")
-            else:
-                # No metadata extracted - this indicates a problem with extraction
-                error_msg = "No flexible metadata extracted from image"
-                logger.error(f"Failed to process {file_path}: {error_msg}")
-                return f"failed:{error_msg}"
-            
-            chunk = DocumentChunk(
-                content=formatted_text,
-                metadata=metadata
-            )
-            
             # Generate embedding with retry logic
             try:
-                embedding = self.embedding_engine.generate_embedding(formatted_text)
+                embedding = self.embedding_engine.generate_embedding(chunk.content)
                 chunk.embedding = embedding
                 
             except RuntimeError as e:
@@ -568,6 +574,72 @@ class DocumentProcessor:
             logger.error(f"Failed to process image file {file_path}: {error_msg}")
             return f"failed:{error_msg}"
 
+    def extract_image_chunk(self, file_path: str, user_id: int) -> Optional[DocumentChunk]:
+        """
+        Run vision extraction on an image and build its chunk without embedding it.
+        
+        Lets bulk reprocessing scripts extract many files first and embed the
+        resulting chunks in batches. Processing state is not touched.
+        
+        Args:
+            file_path: Path to image file
+            user_id: User ID to tag the document with
+            
+        Returns:
+            DocumentChunk without an embedding, or None if no content was extracted
+            
+        Raises:
+            ValueError: If no flexible metadata was extracted
+            Exception: If the vision model fails on the image
+        """
+        extraction = self.image_processor.process_image(file_path)
+        return self._build_image_chunk(extraction, file_path, user_id)
+    
+    def _build_image_chunk(self, extraction, file_path: str, user_id: int) -> Optional[DocumentChunk]:
+        """
+        Build a document chunk from a vision extraction of an image file.
+        
+        Args:
+            extraction: ImageExtraction returned by the image processor
+            file_path: Path to image file
+            user_id: User ID to tag the document with
+            
+        Returns:
+            DocumentChunk without an embedding, or None if no content was extracted
+            
+        Raises:
+            ValueError: If no flexible metadata was extracted
+        """
+        # Format as structured text
+        formatted_text = extraction.format_as_text()
+        
+        if not formatted_text.strip():
+            return None
+        
+        # Create document chunk with metadata
+        path = Path(file_path)
+        metadata = {
+            'user_id': user_id,  # Tag with user ID
+            'filename': path.name,
+            'folder_path': str(path.parent),
+            'file_type': 'image',
+            'chunk_index': 0
+        }
+        
+        # Add all flexible metadata fields dynamically
+        if extraction.flexible_metadata:
+            for key, value in extraction.flexible_metadata.items():
+                metadata[key] = value
+            logger.info(f"Added {len(extraction.flexible_metadata)} flexible metadata fields to chunk")
+        else:
+            # No metadata extracted - this indicates a problem with extraction
+            raise ValueError("No flexible metadata extracted from image")
+        
+        return DocumentChunk(
+            content=formatted_text,
+            metadata=metadata
+        )
+
     def _process_pdf_as_image(self, file_path: str, folder_id: int, user_id: int) -> str:
         """
         Process a PDF by converting pages to images and using vision model.
@@ -630,7 +702,7 @@ class DocumentProcessor:
                             new_height = max_dimension
                             new_width = int(width * (max_dimension / height))
                         logger.debug(f"Resizing page {page_num} from {width}x{height} to {new_width}x{new_height}")
-                        image = image.resize((new_width, new_height), Image.Resampling.LANCZOS)
+                        image = image.resize((new_width, new_height), Image.Resampling.LANCZOS, reducing_gap=3.0)
                     
                     # Save image to temporary file as JPEG (more reliable for vision models)
                     # JPEG doesn't support alpha channels and has simpler format
@@ -677,16 +749,6 @@ class DocumentProcessor:
                         metadata=metadata
                     )
                     
-                    # Generate embedding with retry logic
-                    try:
-                        embedding = self.embedding_engine.generate_embedding(formatted_text)
-                        chunk.embedding = embedding
-                        
-                    except RuntimeError as e:
-                        # Embedding generation failed after retries
-                        logger.error(f"Failed to generate embedding for page {page_num}: {e}")
-                        continue  # Skip this page but continue with others
-                    
                     all_chunks.append(chunk)
                     
                 except Exception as page_error:
@@ -697,6 +759,30 @@ class DocumentProcessor:
                 logger.warning(f"No chunks extracted from PDF: {file_path}")
                 return "skipped"
             
+            # Embed all pages in one batch request; if that fails, fall back to
+            # per-page requests so one bad page doesn't drop the whole PDF
+            try:
+                embeddings = self.embedding_engine.generate_embeddings_batch(
+                    [chunk.content for chunk in all_chunks]
+                )
+                for chunk, embedding in zip(all_chunks, embeddings):
+                    chunk.embedding = embedding
+            except RuntimeError as e:
+                logger.warning(f"Batch embedding failed for {file_path}, retrying per page: {e}")
+                embedded_chunks = []
+                for chunk in all_chunks:
+                    try:
+                        chunk.embedding = self.embedding_engine.generate_embedding(chunk.content)
+                        embedded_chunks.append(chunk)
+                    except RuntimeError as page_error:
+                        # Embedding generation failed after retries
+                        logger.error(f"Failed to generate embedding for page {chunk.metadata['page_number']}: {page_error}")
+                all_chunks = embedded_chunks
+            
+            if not all_chunks:
+                logger.warning(f"No pages of PDF could be embedded: {file_path}")
+                return "skipped"
+            
             # Store all chunks in vector store
             self.vector_store.add_chunks(all_chunks)
             
@@ -9,14 +9,30 @@ It supports batch processing for efficiency and hardware detection for accelerat
 """
 
 import torch
+import numpy as np
 from sentence_transformers import SentenceTransformer
-from typing import List, Union
+from collections import OrderedDict
+from pathlib import Path
+from typing import List, Optional, Tuple, Union
+import hashlib
 import logging
+import sqlite3
+import threading
 import time
 import requests
 
+from backend.config import Config
+
 logger = logging.getLogger(__name__)
 
+# Maximum number of embeddings kept in each engine's LRU cache
+EMBEDDING_CACHE_SIZE = 4096
+
+# Longest text sent to the embedding model; longer texts are cut to this
+# length before caching so single and batch calls embed the same input.
+# bge-m3 supports 8192 tokens (~32k characters)
+MAX_EMBEDDING_CHARS = 30000
+
 
 class EmbeddingEngine:
     """
@@ -27,9 +43,11 @@ class EmbeddingEngine:
     - Falls back to sentence-transformers if Ollama not available
     - Batch processing with configurable batch size (default: 32)
     - Hardware detection (CUDA vs CPU) for acceleration
+    - LRU cache so repeated texts skip the model round-trip
+    - Optional on-disk cache so repeated texts stay cached across runs
     """
     
-    def __init__(self, model_name: str = "mxbai-embed-large", batch_size: int = 32, ollama_endpoint: str = "http://localhost:11434", remote_embedding_api: str = None):
+    def __init__(self, model_name: str = "mxbai-embed-large", batch_size: int = 32, ollama_endpoint: str = "http://localhost:11434", remote_embedding_api: str = None, cache_path: str = None):
         """
         Initialize the embedding engine.
         
@@ -38,15 +56,25 @@ class EmbeddingEngine:
             batch_size: Number of texts to process in each batch
             ollama_endpoint: Ollama API endpoint
             remote_embedding_api: Optional remote API endpoint for embeddings (e.g., "http://192.168.1.100:8000")
+            cache_path: Optional SQLite file for a persistent embedding cache (disabled if None)
         """
         self.model_name = model_name
         self.batch_size = batch_size
         self.ollama_endpoint = ollama_endpoint
+        # Ask Ollama to keep the embedding model resident between calls
+        self.keep_alive = Config.OLLAMA_KEEP_ALIVE
         self.remote_embedding_api = remote_embedding_api
         self.use_ollama = False
         self.use_remote = False
         self.device = self._detect_hardware()
         
+        # LRU cache of text digest -> embedding, shared by single and batch calls
+        self._cache = OrderedDict()
+        self._cache_lock = threading.Lock()
+        self.cache_hits = 0
+        self.cache_misses = 0
+        self._disk_cache = self._open_disk_cache(cache_path) if cache_path else None
+        
         logger.info(f"Initializing embedding engine with model: {model_name}")
         
         # Try remote API first (if configured)
@@ -118,16 +146,9 @@ class EmbeddingEngine:
     def _generate_ollama_embedding(self, text: str) -> List[float]:
         """Generate embedding using Ollama API."""
         try:
-            # Truncate text if too long (Ollama has token limits)
-            # bge-m3 supports 8192 tokens (~32k characters)
-            max_chars = 30000
-            if len(text) > max_chars:
-                logger.warning(f"Text too long ({len(text)} chars), truncating to {max_chars}")
-                text = text[:max_chars]
-            
             response = requests.post(
                 f"{self.ollama_endpoint}/api/embed",
-                json={"model": self.model_name, "input": text},
+                json={"model": self.model_name, "input": text, "keep_alive": self.keep_alive},
                 timeout=120  # Increased timeout for Pi with swap
             )
             response.raise_for_status()
@@ -139,6 +160,33 @@ class EmbeddingEngine:
             logger.error(f"Ollama embedding generation failed: {e}")
             raise
     
+    def _generate_ollama_embeddings_batch(self, texts: List[str]) -> List[List[float]]:
+        """
+        Generate embeddings for several texts with batched Ollama /api/embed calls.
+        
+        Sends up to batch_size texts per request instead of one request per text.
+        Falls back to per-text requests if a response does not contain one
+        embedding per input.
+        """
+        embeddings_list = []
+        for start in range(0, len(texts), self.batch_size):
+            batch = texts[start:start + self.batch_size]
+            response = requests.post(
+                f"{self.ollama_endpoint}/api/embed",
+                json={"model": self.model_name, "input": batch, "keep_alive": self.keep_alive},
+                timeout=120  # Increased timeout for Pi with swap
+            )
+            response.raise_for_status()
+            embeddings = response.json().get("embeddings")
+            
+            if not embeddings or len(embeddings) != len(batch):
+                logger.warning("Ollama batch embedding response incomplete, falling back to sequential requests")
+                embeddings = [self._generate_ollama_embedding(text) for text in batch]
+            
+            embeddings_list.extend(embeddings)
+        
+        return embeddings_list
+    
     def _detect_hardware(self) -> str:
         """
         Detect available hardware for acceleration.
@@ -170,6 +218,136 @@ class EmbeddingEngine:
         """
         return self._embedding_dimension
     
+    @staticmethod
+    def _open_disk_cache(cache_path: str) -> sqlite3.Connection:
+        """
+        Open (and create if needed) the persistent embedding cache.
+        
+        Args:
+            cache_path: Path to the SQLite cache file
+            
+        Returns:
+            SQLite connection shared by all threads (guarded by _cache_lock)
+        """
+        Path(cache_path).parent.mkdir(parents=True, exist_ok=True)
+        conn = sqlite3.connect(cache_path, check_same_thread=False)
+        conn.execute("PRAGMA journal_mode = WAL")
+        conn.execute("PRAGMA synchronous = NORMAL")
+        conn.execute(
+            "CREATE TABLE IF NOT EXISTS embeddings (key BLOB PRIMARY KEY, vector BLOB NOT NULL)"
+        )
+        conn.commit()
+        logger.info(f"Persistent embedding cache: {cache_path}")
+        return conn
+    
+    def _cache_key(self, text: str) -> bytes:
+        """
+        Digest used as the cache key, so the cache doesn't hold full texts.
+        
+        The model name is part of the key so cached vectors are never reused
+        across embedding models (the disk cache outlives the engine).
+        """
+        return hashlib.blake2b(f"{self.model_name}|{text}".encode('utf-8'), digest_size=16).digest()
+    
+    def _cache_get(self, key: bytes) -> Optional[List[float]]:
+        """
+        Look up a cached embedding and record the hit or miss.
+        
+        Checks the in-memory LRU first, then the disk cache if one is open.
+        
+        Args:
+            key: Cache key from _cache_key
+            
+        Returns:
+            Copy of the cached embedding, or None if not cached
+        """
+        with self._cache_lock:
+            embedding = self._cache.get(key)
+            if embedding is not None:
+                self._cache.move_to_end(key)
+                self.cache_hits += 1
+                return list(embedding)
+            
+            if self._disk_cache is not None:
+                row = self._disk_cache.execute(
+                    "SELECT vector FROM embeddings WHERE key = ?",
+                    (key,)
+                ).fetchone()
+                if row is not None:
+                    embedding = np.frombuffer(row[0], dtype=np.float32).tolist()
+                    self._remember(key, embedding)
+                    self.cache_hits += 1
+                    return list(embedding)
+            
+            self.cache_misses += 1
+            return None
+    
+    def _cache_put(self, key: bytes, embedding: List[float]) -> None:
+        """Store an embedding, evicting the least recently used entry if full."""
+        self._cache_put_many([(key, embedding)])
+    
+    def _cache_put_many(self, entries: List[Tuple[bytes, List[float]]]) -> None:
+        """
+        Store several embeddings, writing them to the disk cache in one commit.
+        
+        Args:
+            entries: List of (cache key, embedding) pairs
+        """
+        if not entries:
+            return
+        
+        with self._cache_lock:
+            for key, embedding in entries:
+                self._remember(key, embedding)
+            
+            if self._disk_cache is not None:
+                self._disk_cache.executemany(
+                    "INSERT OR REPLACE INTO embeddings (key, vector) VALUES (?, ?)",
+                    [
+                        (key, np.asarray(embedding, dtype=np.float32).tobytes())
+                        for key, embedding in entries
+                    ]
+                )
+                self._disk_cache.commit()
+    
+    def _remember(self, key: bytes, embedding: List[float]) -> None:
+        """Add an entry to the in-memory LRU. Caller must hold _cache_lock."""
+        self._cache[key] = list(embedding)
+        self._cache.move_to_end(key)
+        if len(self._cache) > EMBEDDING_CACHE_SIZE:
+            self._cache.popitem(last=False)
+    
+    def get_cache_info(self) -> dict:
+        """
+        Get embedding cache statistics.
+        
+        Returns:
+            Dictionary with hits, misses, current size and maximum size
+        """
+        with self._cache_lock:
+            return {
+                "hits": self.cache_hits,
+                "misses": self.cache_misses,
+                "size": len(self._cache),
+                "maxsize": EMBEDDING_CACHE_SIZE
+            }
+    
+    @staticmethod
+    def _truncate(text: str) -> str:
+        """
+        Cut text to MAX_EMBEDDING_CHARS to stay within the model's token limit.
+        
+        Args:
+            text: Input text
+            
+        Returns:
+            The text, truncated if it was too long
+        """
+        if len(text) > MAX_EMBEDDING_CHARS:
+            logger.warning(f"Text too long ({len(text)} chars), truncating to {MAX_EMBEDDING_CHARS} chars")
+            return text[:MAX_EMBEDDING_CHARS]
+        return text
+    
     def generate_embedding(self, text: str, max_retries: int = 3) -> List[float]:
         """
         Generate embedding for a single text with retry logic.
@@ -189,13 +367,11 @@ class EmbeddingEngine:
             # Return zero vector for empty text
             return [0.0] * self.get_embedding_dimension()
         
-        # Truncate text if it's too long to prevent 400 Bad Request errors
-        # qwen3-embedding supports 40960 tokens (~160k characters)
-        # Being conservative but allowing much more text for better context
-        MAX_CHARS = 32000
-        if len(text) > MAX_CHARS:
-            logger.warning(f"Text too long ({len(text)} chars), truncating to {MAX_CHARS} chars")
-            text = text[:MAX_CHARS] + "... [truncated]"
+        text = self._truncate(text)
+        cache_key = self._cache_key(text)
+        cached = self._cache_get(cache_key)
+        if cached is not None:
+            return cached
         
         last_error = None
         for attempt in range(max_retries):
@@ -205,6 +381,7 @@ class EmbeddingEngine:
                 else:
                     embedding = self.model.encode(text, convert_to_tensor=False, show_progress_bar=False)
                     embedding = embedding.tolist()
+                self._cache_put(cache_key, embedding)
                 return embedding
             except Exception as e:
                 last_error = e
@@ -244,7 +421,7 @@ class EmbeddingEngine:
         non_empty_indices = []
         for i, text in enumerate(texts):
             if text and text.strip():
-                non_empty_texts.append(text)
+                non_empty_texts.append(self._truncate(text))
                 non_empty_indices.append(i)
         
         if not non_empty_texts:
@@ -253,28 +430,46 @@ class EmbeddingEngine:
             dim = self.get_embedding_dimension()
             return [[0.0] * dim for _ in texts]
         
-        logger.info(f"Generating embeddings for {len(non_empty_texts)} texts (batch size: {self.batch_size})")
+        # Serve cached texts directly and embed each uncached text only once
+        cache_keys = [self._cache_key(text) for text in non_empty_texts]
+        cached = [self._cache_get(key) for key in cache_keys]
+        uncached = OrderedDict()
+        for key, text, embedding in zip(cache_keys, non_empty_texts, cached):
+            if embedding is None and key not in uncached:
+                uncached[key] = text
+        
+        logger.info(
+            f"Generating embeddings for {len(uncached)} texts "
+            f"({len(non_empty_texts) - len(uncached)} cached, batch size: {self.batch_size})"
+        )
         
         # Generate embeddings with batch processing and retry logic
         last_error = None
         for attempt in range(max_retries):
             try:
-                if self.use_ollama:
-                    # Ollama doesn't support batch processing well, so process individually
-                    # but we can do it more efficiently
-                    embeddings_list = []
-                    for text in non_empty_texts:
-                        emb = self._generate_ollama_embedding(text)
-                        embeddings_list.append(emb)
+                uncached_texts = list(uncached.values())
+                if not uncached_texts:
+                    new_embeddings = []
+                elif self.use_ollama:
+                    # /api/embed accepts a list of inputs, so send whole batches per request
+                    new_embeddings = self._generate_ollama_embeddings_batch(uncached_texts)
                 else:
                     embeddings = self.model.encode(
-                        non_empty_texts,
+                        uncached_texts,
                         batch_size=self.batch_size,
                         convert_to_tensor=False,
-                        show_progress_bar=len(non_empty_texts) > 100  # Show progress for large batches
+                        show_progress_bar=len(uncached_texts) > 100  # Show progress for large batches
                     )
                     # Convert to list of lists
-                    embeddings_list = [emb.tolist() for emb in embeddings]
+                    new_embeddings = [emb.tolist() for emb in embeddings]
+                
+                self._cache_put_many(list(zip(uncached.keys(), new_embeddings)))
+                
+                by_key = dict(zip(uncached.keys(), new_embeddings))
+                embeddings_list = [
+                    embedding if embedding is not None else by_key[key]
+                    for key, embedding in zip(cache_keys, cached)
+                ]
                 
                 # Reconstruct full list with zero vectors for empty texts
                 dim = self.get_embedding_dimension()
@@ -317,7 +512,8 @@ class EmbeddingEngine:
             "model_name": self.model_name,
             "batch_size": self.batch_size,
             "embedding_dimension": self.get_embedding_dimension(),
-            "using_ollama": self.use_ollama
+            "using_ollama": self.use_ollama,
+            "cache": self.get_cache_info()
         }
         
         if self.device == 'cuda':
@@ -338,6 +534,9 @@ def get_embedding_engine(model_name: str = None, ollama_endpoint: str = None) ->
     """
     Get or create the singleton embedding engine instance.
     
+    The existing instance is reused unless a different model or endpoint is
+    explicitly requested, in which case it is replaced.
+    
     Args:
         model_name: Optional model name (uses config default if not provided)
         ollama_endpoint: Optional Ollama endpoint (uses config default if not provided)
@@ -346,9 +545,19 @@ def get_embedding_engine(model_name: str = None, ollama_endpoint: str = None) ->
         EmbeddingEngine instance
     """
     global _embedding_engine_instance
+    if _embedding_engine_instance is not None:
+        if (model_name and model_name != _embedding_engine_instance.model_name) or \
+                (ollama_endpoint and ollama_endpoint != _embedding_engine_instance.ollama_endpoint):
+            logger.info(f"Replacing embedding engine for {_embedding_engine_instance.model_name} "
+                        f"with {model_name or _embedding_engine_instance.model_name}")
+            _embedding_engine_instance = None
+    
     if _embedding_engine_instance is None:
-        from backend.config import Config
         model_name = model_name or Config.EMBEDDING_MODEL
         ollama_endpoint = ollama_endpoint or Config.OLLAMA_ENDPOINT
-        _embedding_engine_instance = EmbeddingEngine(model_name=model_name, ollama_endpoint=ollama_endpoint)
+        _embedding_engine_instance = EmbeddingEngine(
+            model_name=model_name,
+            ollama_endpoint=ollama_endpoint,
+            cache_path=Config.EMBEDDING_CACHE_PATH or None
+        )
     return _embedding_engine_instance
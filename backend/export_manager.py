@@ -28,6 +28,18 @@ from backend.database import DatabaseManager
 
 logger = logging.getLogger(__name__)
 
+# Number of chunks read from ChromaDB per page when scanning the collection
+EXPORT_PAGE_SIZE = 1000
+
+# HNSW settings for exported collections. The Pi only queries the index, so a
+# denser graph (M=32) built with a wider beam pays off in recall per query.
+EXPORT_HNSW_METADATA = {
+    "hnsw:space": "cosine",
+    "hnsw:M": 32,
+    "hnsw:construction_ef": 200,
+    "hnsw:search_ef": 64,
+}
+
 
 @dataclass
 class ExportResult:
@@ -458,27 +470,12 @@ class ExportManager:
                 )
                 modified_files = {row['file_path'] for row in cursor.fetchall()}
                 
-                # Count chunks from modified files
-                # We need to get all chunks and filter by file path
+                # Count chunks from modified files, scanning metadata page by page
                 try:
-                    all_data = self.vector_store.collection.get(
-                        include=["metadatas"]
-                    )
-                    
                     new_chunks = 0
-                    for metadata in all_data['metadatas']:
-                        if 'filename' in metadata and 'folder_path' in metadata:
-                            # Construct file path from metadata
-                            # Use forward slashes for consistency with database storage
-                            folder_path = metadata['folder_path'].replace('\\', '/')
-                            filename = metadata['filename']
-                            file_path = f"{folder_path}/{filename}" if not folder_path.endswith('/') else f"{folder_path}{filename}"
-                            
-                            # Also check with Path normalization for cross-platform compatibility
-                            file_path_normalized = str(Path(metadata['folder_path']) / metadata['filename'])
-                            
-                            # Check if this file was modified after the timestamp
-                            if file_path in modified_files or file_path_normalized in modified_files:
+                    for page in self._iter_collection_pages(["metadatas"]):
+                        for metadata in page['metadatas']:
+                            if self._chunk_in_files(metadata, modified_files):
                                 new_chunks += 1
                     
                     stats['new_chunks'] = new_chunks
@@ -602,45 +599,7 @@ class ExportManager:
             dest_path.mkdir(parents=True, exist_ok=True)
             return
         
-        # Get all chunks from source vector store
-        # ChromaDB doesn't have a direct "get all" method, so we need to use get() with no filters
-        try:
-            all_data = self.vector_store.collection.get(
-                include=["documents", "metadatas", "embeddings"]
-            )
-        except Exception as e:
-            logger.error(f"Failed to retrieve chunks from vector store: {e}")
-            raise
-        
-        # Filter chunks that belong to modified files
-        filtered_ids = []
-        filtered_embeddings = []
-        filtered_documents = []
-        filtered_metadatas = []
-        
-        for i, metadata in enumerate(all_data['metadatas']):
-            # Check if this chunk belongs to a modified file
-            # The metadata should have 'filename' and 'folder_path'
-            if 'filename' in metadata and 'folder_path' in metadata:
-                # Construct file path from metadata
-                # Use forward slashes for consistency with database storage
-                folder_path = metadata['folder_path'].replace('\\', '/')
-                filename = metadata['filename']
-                file_path = f"{folder_path}/{filename}" if not folder_path.endswith('/') else f"{folder_path}{filename}"
-                
-                # Also check with Path normalization for cross-platform compatibility
-                file_path_normalized = str(Path(metadata['folder_path']) / metadata['filename'])
-                
-                # Check if this file was modified after the timestamp
-                if file_path in modified_files or file_path_normalized in modified_files:
-                    filtered_ids.append(all_data['ids'][i])
-                    filtered_embeddings.append(all_data['embeddings'][i])
-                    filtered_documents.append(all_data['documents'][i])
-                    filtered_metadatas.append(metadata)
-        
-        logger.info(f"Filtered {len(filtered_ids)} chunks from {len(all_data['ids'])} total chunks")
-        
-        # Create new ChromaDB at destination with filtered chunks
+        # Create new ChromaDB at destination
         if dest_path.exists():
             shutil.rmtree(dest_path)
         dest_path.mkdir(parents=True, exist_ok=True)
@@ -654,22 +613,101 @@ class ExportManager:
         # Create collection with same name as source
         collection = client.get_or_create_collection(
             name=self.vector_store.collection.name,
-            metadata={"hnsw:space": "cosine"}
+            metadata=dict(EXPORT_HNSW_METADATA)
         )
         
-        # Add filtered chunks to new collection
-        if filtered_ids:
-            collection.add(
-                ids=filtered_ids,
-                embeddings=filtered_embeddings,
-                documents=filtered_documents,
-                metadatas=filtered_metadatas
-            )
-            logger.info(f"Added {len(filtered_ids)} chunks to incremental ChromaDB")
+        # Copy chunks that belong to modified files one page at a time, so peak
+        # memory is bounded by the page size rather than the whole collection
+        total_chunks = 0
+        added_chunks = 0
+        try:
+            for page in self._iter_collection_pages(["documents", "metadatas", "embeddings"]):
+                total_chunks += len(page['ids'])
+                
+                filtered_ids = []
+                filtered_embeddings = []
+                filtered_documents = []
+                filtered_metadatas = []
+                
+                for i, metadata in enumerate(page['metadatas']):
+                    if self._chunk_in_files(metadata, modified_files):
+                        filtered_ids.append(page['ids'][i])
+                        filtered_embeddings.append(page['embeddings'][i])
+                        filtered_documents.append(page['documents'][i])
+                        filtered_metadatas.append(metadata)
+                
+                if filtered_ids:
+                    collection.add(
+                        ids=filtered_ids,
+                        embeddings=filtered_embeddings,
+                        documents=filtered_documents,
+                        metadatas=filtered_metadatas
+                    )
+                    added_chunks += len(filtered_ids)
+        except Exception as e:
+            logger.error(f"Failed to copy chunks from vector store: {e}")
+            raise
+        
+        logger.info(f"Filtered {added_chunks} chunks from {total_chunks} total chunks")
+        
+        if added_chunks:
+            logger.info(f"Added {added_chunks} chunks to incremental ChromaDB")
         else:
             logger.warning("No chunks to add to incremental ChromaDB")
-
     
+    def _iter_collection_pages(self, include: List[str], page_size: int = EXPORT_PAGE_SIZE):
+        """
+        Iterate over the source collection in fixed-size pages.
+        
+        Args:
+            include: Fields to fetch for each chunk (e.g. ["metadatas"])
+            page_size: Maximum number of chunks per page
+            
+        Yields:
+            ChromaDB get() results for each page
+        """
+        offset = 0
+        while True:
+            page = self.vector_store.collection.get(
+                include=include,
+                limit=page_size,
+                offset=offset
+            )
+            if not page['ids']:
+                return
+            
+            yield page
+            
+            if len(page['ids']) < page_size:
+                return
+            offset += page_size
+    
+    @staticmethod
+    def _chunk_in_files(metadata: Dict[str, Any], file_paths: set) -> bool:
+        """
+        Check whether a chunk's metadata points at one of the given files.
+        
+        Args:
+            metadata: Chunk metadata with 'filename' and 'folder_path'
+            file_paths: File paths as stored in processed_files
+            
+        Returns:
+            True if the chunk belongs to one of the files
+        """
+        if 'filename' not in metadata or 'folder_path' not in metadata:
+            return False
+        
+        # Construct file path from metadata
+        # Use forward slashes for consistency with database storage
+        folder_path = metadata['folder_path'].replace('\\', '/')
+        filename = metadata['filename']
+        file_path = f"{folder_path}/{filename}" if not folder_path.endswith('/') else f"{folder_path}{filename}"
+        
+        # Also check with Path normalization for cross-platform compatibility
+        file_path_normalized = str(Path(metadata['folder_path']) / metadata['filename'])
+        
+        return file_path in file_paths or file_path_normalized in file_paths
+
     def _generate_pi_config(self) -> str:
         """
         Generate Pi configuration template.
@@ -5,12 +5,17 @@ Uses Ollama vision model (Qwen2.5-VL 7B) to extract structured data
 from images including receipts, legal documents, passports, and general documents.
 """
 
+import hashlib
+import json
+import math
+import os
 import re
 from typing import Optional, Dict
 from pathlib import Path
 
 from backend.ollama_client import OllamaClient, OllamaError, encode_image_to_base64
 from backend.models import ImageExtraction
+from backend.processing_state import file_sha256
 
 
 # Optimized document extraction prompt for qwen3-vl
@@ -62,28 +67,98 @@ RIGHT (DO THIS):
 
 Output ONLY valid JSON."""
 
+# Patterns used by ImageProcessor._parse_response, compiled once at import
+THINK_TAG_PATTERN = re.compile(r'<think>.*?</think>', re.DOTALL)
+JSON_MARKER_PATTERN = re.compile(r'===JSON_START===\s*(\{.*?\})\s*===JSON_END===', re.DOTALL)
+MARKDOWN_JSON_PATTERN = re.compile(r'```json\s*(\{.*?\})\s*```', re.DOTALL)
+
 
 class ImageProcessor:
     """Processor for extracting content from images using vision model."""
     
-    def __init__(self, ollama_client: Optional[OllamaClient] = None):
+    def __init__(self, ollama_client: Optional[OllamaClient] = None, cache_dir: Optional[str] = None):
         """
         Initialize image processor.
         
         Args:
             ollama_client: OllamaClient instance (creates new one if None)
+            cache_dir: Directory for cached extractions (uses Config.VISION_CACHE_DIR if None;
+                caching is disabled when both are empty)
         """
         from backend.config import Config
         self.client = ollama_client or OllamaClient(model=Config.OLLAMA_VISION_MODEL)
         
+        cache_dir = cache_dir if cache_dir is not None else Config.VISION_CACHE_DIR
+        self.cache_dir = Path(cache_dir) if cache_dir else None
+        if self.cache_dir:
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+        
         import logging
         logger = logging.getLogger(__name__)
         logger.info(f"ImageProcessor initialized with vision model: {self.client.model}")
+        if self.cache_dir:
+            logger.info(f"Vision extraction cache: {self.cache_dir}")
+    
+    def _cache_path(self, image_path: str) -> Path:
+        """
+        Get the cache file for an image's extraction.
+        
+        The key covers the image bytes, the vision model and the prompt, so
+        editing the image or changing either of those never reuses a stale result.
+        
+        Args:
+            image_path: Path to image file
+            
+        Returns:
+            Path of the JSON cache file (may not exist yet)
+        """
+        image_hash = file_sha256(image_path)
+        
+        key = hashlib.sha256(
+            f"{self.client.model}|{DOCUMENT_EXTRACTION_PROMPT}|{image_hash}".encode("utf-8")
+        ).hexdigest()
+        return self.cache_dir / f"{key}.json"
+    
+    def _load_cached_extraction(self, cache_path: Path) -> Optional[ImageExtraction]:
+        """Load a cached extraction, or None if missing or unreadable."""
+        try:
+            with open(cache_path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            return ImageExtraction(
+                raw_text=data["raw_text"],
+                flexible_metadata=data["flexible_metadata"]
+            )
+        except (OSError, ValueError, KeyError, TypeError):
+            return None
+    
+    def _save_cached_extraction(self, cache_path: Path, extraction: ImageExtraction) -> None:
+        """Write an extraction to the cache atomically (best effort)."""
+        import logging
+        logger = logging.getLogger(__name__)
+        
+        tmp_path = cache_path.with_suffix(".tmp")
+        try:
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(
+                    {
+                        "raw_text": extraction.raw_text,
+                        "flexible_metadata": extraction.flexible_metadata
+                    },
+                    f,
+                    ensure_ascii=False,
+                    default=str
+                )
+            os.replace(tmp_path, cache_path)
+        except OSError as e:
+            logger.warning(f"Failed to write vision cache entry {cache_path}: {e}")
     
     def process_image(self, image_path: str) -> ImageExtraction:
         """
         Process image and extract structured data.
 
+        Results are served from the extraction cache when one is configured and
+        the same image bytes were already processed with this model and prompt.
+
         Automatically corrects image orientation (rotation, flip) and format before processing.
         Enhanced preprocessing prevents GGML errors by ensuring clean RGB JPEG format.
 
@@ -105,6 +180,13 @@ class ImageProcessor:
         import logging
         logger = logging.getLogger(__name__)
 
+        cache_path = self._cache_path(image_path) if self.cache_dir else None
+        if cache_path:
+            cached = self._load_cached_extraction(cache_path)
+            if cached is not None:
+                logger.info(f"Using cached vision extraction for {image_path}")
+                return cached
+
         # Preprocess image: correct orientation and format
         corrected_image_path = self._correct_image_orientation(image_path)
 
@@ -152,6 +234,10 @@ class ImageProcessor:
                 except:
                     pass
 
+            # Empty extractions are usually transient model failures; let them retry
+            if cache_path and extraction.flexible_metadata:
+                self._save_cached_extraction(cache_path, extraction)
+
             return extraction
 
         except OllamaError as e:
@@ -226,6 +312,12 @@ class ImageProcessor:
                     raise IOError(f"Invalid image dimensions: {width}x{height}")
                 if width > 10000 or height > 10000:
                     logger.warning(f"Image {image_path} has very large dimensions: {width}x{height}")
+                
+                # Let libjpeg decode at a reduced scale when the image will be downsized anyway;
+                # draft keeps both sides >= the resize target, so the Lanczos pass still sets quality
+                scale = 1536 / max(width, height)
+                if image.format == 'JPEG' and scale < 1:
+                    image.draft(None, (math.ceil(width * scale), math.ceil(height * scale)))
             
             # Step 1: Apply EXIF orientation correction
             try:
@@ -313,7 +405,8 @@ class ImageProcessor:
             import logging
             logger = logging.getLogger(__name__)
             logger.debug(f"Resizing image from {width}x{height} to {new_width}x{new_height}")
-            return image.resize((new_width, new_height), Image.Resampling.LANCZOS)
+            # reducing_gap lets Pillow box-reduce large downscales before the Lanczos pass
+            return image.resize((new_width, new_height), Image.Resampling.LANCZOS, reducing_gap=3.0)
         
         return image
     
@@ -451,7 +544,6 @@ class ImageProcessor:
         Returns:
             ImageExtraction with parsed data and flexible metadata
         """
-        import json
         import logging
         logger = logging.getLogger(__name__)
         
@@ -462,7 +554,7 @@ class ImageProcessor:
         # Handle qwen3-vl thinking tags - strip everything inside <think>...</think>
         if '<think>' in raw_text and '</think>' in raw_text:
             # Remove all thinking content
-            raw_text = re.sub(r'<think>.*?</think>', '', raw_text, flags=re.DOTALL).strip()
+            raw_text = THINK_TAG_PATTERN.sub('', raw_text).strip()
             logger.debug(f"Stripped <think> tags, remaining content: {len(raw_text)} chars")
         
         # CRITICAL: Detect and fix repetition loops before parsing
@@ -493,7 +585,7 @@ class ImageProcessor:
         # Check for JSON markers (===JSON_START=== and ===JSON_END===)
         if data is None and '===JSON_START===' in raw_text and '===JSON_END===' in raw_text:
             # Extract JSON between markers
-            json_match = re.search(r'===JSON_START===\s*(\{.*?\})\s*===JSON_END===', raw_text, re.DOTALL)
+            json_match = JSON_MARKER_PATTERN.search(raw_text)
             if json_match:
                 try:
                     data = json.loads(json_match.group(1), strict=False)
@@ -504,7 +596,7 @@ class ImageProcessor:
         
         # Try markdown code block format
         if data is None:
-            json_match = re.search(r'```json\s*(\{.*?\})\s*```', raw_text, re.DOTALL)
+            json_match = MARKDOWN_JSON_PATTERN.search(raw_text)
             if json_match:
                 try:
                     data = json.loads(json_match.group(1), strict=False)
@@ -513,6 +605,12 @@ class ImageProcessor:
                     logger.warning(f"Failed to parse JSON from markdown: {e}")
                     pass
         
+        # Last resort: find a JSON object embedded in surrounding prose
+        if data is None:
+            data = self._extract_embedded_json(raw_text)
+            if data is not None:
+                logger.debug("Successfully parsed JSON embedded in text")
+        
         # If we successfully parsed JSON, flatten and filter to keep only useful fields
         if data is not None:
             def flatten_dict(d, parent_key='', sep='_', max_list_items=5):
@@ -569,6 +667,72 @@ class ImageProcessor:
             flexible_metadata=flexible_metadata
         )
     
+    def _extract_embedded_json(self, raw_text: str) -> Optional[dict]:
+        """
+        Find the first top-level JSON object embedded in free text.
+        
+        Each outermost '{' is handed to JSONDecoder.raw_decode, which parses one
+        value and stops, so text after the object is ignored without extra passes.
+        A '{' that fails to decode is skipped together with everything up to its
+        matching '}', so objects nested inside it (e.g. the line items of a
+        truncated receipt) are never returned in place of the receipt itself.
+        
+        Args:
+            raw_text: Model output that may wrap JSON in prose
+            
+        Returns:
+            Parsed dictionary, or None if no top-level JSON object decodes
+        """
+        decoder = json.JSONDecoder(strict=False)
+        start = raw_text.find('{')
+        while start != -1:
+            try:
+                data, _ = decoder.raw_decode(raw_text, start)
+                return data
+            except json.JSONDecodeError:
+                pass
+            
+            end = self._find_closing_brace(raw_text, start)
+            if end == -1:
+                # Unclosed (truncated) object: every later '{' is nested in it
+                return None
+            start = raw_text.find('{', end + 1)
+        return None
+    
+    @staticmethod
+    def _find_closing_brace(text: str, start: int) -> int:
+        """
+        Find the '}' that closes the '{' at start, skipping braces in strings.
+        
+        Args:
+            text: Text to scan
+            start: Index of an opening '{'
+            
+        Returns:
+            Index of the matching '}', or -1 if it is never closed
+        """
+        depth = 0
+        in_string = False
+        escaped = False
+        for i in range(start, len(text)):
+            char = text[i]
+            if in_string:
+                if escaped:
+                    escaped = False
+                elif char == '\\':
+                    escaped = True
+                elif char == '"':
+                    in_string = False
+            elif char == '"':
+                in_string = True
+            elif char == '{':
+                depth += 1
+            elif char == '}':
+                depth -= 1
+                if depth == 0:
+                    return i
+        return -1
+    
     def _filter_useful_fields(self, fields: Dict[str, str]) -> Dict[str, str]:
         """
         Filter metadata fields to keep only the most useful information.
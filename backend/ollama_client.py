@@ -12,11 +12,17 @@ import requests
 import logging
 from typing import Optional, Dict, Any
 from pathlib import Path
+from requests.adapters import HTTPAdapter
 
 from backend.config import Config
 
 logger = logging.getLogger(__name__)
 
+# Shared HTTP session so every client reuses keep-alive connections to Ollama
+_session = requests.Session()
+_session.mount("http://", HTTPAdapter(pool_connections=4, pool_maxsize=16))
+_session.mount("https://", HTTPAdapter(pool_connections=4, pool_maxsize=16))
+
 
 class OllamaClient:
     """Client for interacting with Ollama API."""
@@ -69,7 +75,7 @@ class OllamaClient:
             True if Ollama is running, False otherwise
         """
         try:
-            response = requests.get(
+            response = _session.get(
                 f"{self.endpoint}/api/tags",
                 timeout=5
             )
@@ -85,7 +91,7 @@ class OllamaClient:
             True if model is available, False otherwise
         """
         try:
-            response = requests.get(
+            response = _session.get(
                 f"{self.endpoint}/api/tags",
                 timeout=5
             )
@@ -119,7 +125,7 @@ class OllamaClient:
                 "stream": False
             }
             
-            response = requests.post(
+            response = _session.post(
                 f"{self.endpoint}/api/generate",
                 json=test_payload,
                 timeout=30
@@ -192,7 +198,7 @@ class OllamaClient:
         
         for attempt in range(max_retries):
             try:
-                response = requests.post(
+                response = _session.post(
                     f"{self.endpoint}/api/generate",
                     json=payload,
                     timeout=self.timeout
@@ -9,13 +9,44 @@ import hashlib
 import logging
 from datetime import datetime
 from pathlib import Path
-from typing import Optional, Literal
+from typing import List, Optional, Literal, Tuple
 
 from backend.database import DatabaseManager
 
 logger = logging.getLogger(__name__)
 
 
+def file_sha256(file_path: str) -> str:
+    """
+    Compute the SHA-256 hash of a file's contents.
+    
+    Args:
+        file_path: Path to file
+        
+    Returns:
+        Hexadecimal hash string
+        
+    Raises:
+        OSError: If the file cannot be read
+    """
+    with open(file_path, "rb") as f:
+        # file_digest (Python 3.11+) hashes with the GIL released
+        if hasattr(hashlib, "file_digest"):
+            return hashlib.file_digest(f, "sha256").hexdigest()
+        
+        # Read file in reusable 1 MiB chunks to handle large files efficiently
+        sha256_hash = hashlib.sha256()
+        buffer = bytearray(1 << 20)
+        view = memoryview(buffer)
+        while True:
+            size = f.readinto(buffer)
+            if not size:
+                break
+            sha256_hash.update(view[:size])
+        
+        return sha256_hash.hexdigest()
+
+
 class ProcessingStateManager:
     """Manages processing state for incremental document updates."""
     
@@ -51,14 +82,7 @@ class ProcessingStateManager:
             raise IOError(f"Not a file: {file_path}")
         
         try:
-            sha256_hash = hashlib.sha256()
-            
-            # Read file in chunks to handle large files efficiently
-            with open(path, "rb") as f:
-                for chunk in iter(lambda: f.read(8192), b""):
-                    sha256_hash.update(chunk)
-            
-            return sha256_hash.hexdigest()
+            return file_sha256(file_path)
         
         except Exception as e:
             logger.error(f"Failed to compute hash for {file_path}: {e}")
@@ -140,6 +164,57 @@ class ProcessingStateManager:
             file_type: Type of file ("text" or "image")
             user_id: User ID who owns this file
             
+        Raises:
+            FileNotFoundError: If file doesn't exist
+            IOError: If file cannot be accessed
+            ValueError: If folder_id is invalid or file_type is invalid
+        """
+        self.update_file_states([(file_path, folder_id, file_type, user_id)])
+    
+    def update_file_states(
+        self,
+        files: List[Tuple[str, int, Literal["text", "image"], int]]
+    ) -> None:
+        """
+        Update processing state for several files in a single transaction.
+        
+        Rows are written with one executemany call, so bulk reprocessing pays
+        for one commit instead of one per file.
+        
+        Args:
+            files: List of (file_path, folder_id, file_type, user_id) tuples
+            
+        Raises:
+            FileNotFoundError: If a file doesn't exist
+            IOError: If a file cannot be accessed
+            ValueError: If a folder_id or file_type is invalid
+        """
+        rows = [self.build_file_state_row(*file) for file in files]
+        self.write_file_states(rows)
+    
+    def build_file_state_row(
+        self,
+        file_path: str,
+        folder_id: int,
+        file_type: Literal["text", "image"],
+        user_id: int
+    ) -> Tuple[str, int, int, str, str, str]:
+        """
+        Validate a processed file and capture its current state for storage.
+        
+        Callers that buffer state updates build rows as each file finishes, so
+        a file that later moves or changes can't fail the whole batch and any
+        error is raised for the file it belongs to.
+        
+        Args:
+            file_path: Path to processed file
+            folder_id: ID of folder containing the file
+            file_type: Type of file ("text" or "image")
+            user_id: User ID who owns this file
+            
+        Returns:
+            Row for write_file_states
+            
         Raises:
             FileNotFoundError: If file doesn't exist
             IOError: If file cannot be accessed
@@ -170,9 +245,28 @@ class ProcessingStateManager:
             if cursor.fetchone() is None:
                 raise ValueError(f"Invalid folder_id: {folder_id}")
         
-        # Insert or update processing state
+        return (
+            str(path.absolute()),
+            folder_id,
+            user_id,
+            current_hash,
+            current_mtime.isoformat(),
+            file_type
+        )
+    
+    def write_file_states(self, rows: List[Tuple[str, int, int, str, str, str]]) -> None:
+        """
+        Store rows from build_file_state_row in a single transaction.
+        
+        Args:
+            rows: Rows built by build_file_state_row
+        """
+        if not rows:
+            return
+        
         with self.db.transaction() as conn:
-            conn.execute(
+            # Insert or update processing state
+            conn.executemany(
                 """
                 INSERT INTO processed_files 
                     (file_path, folder_id, user_id, file_hash, modified_at, file_type)
@@ -184,14 +278,8 @@ class ProcessingStateManager:
                     file_type = excluded.file_type,
                     folder_id = excluded.folder_id
                 """,
-                (
-                    str(path.absolute()),
-                    folder_id,
-                    user_id,
-                    current_hash,
-                    current_mtime.isoformat(),
-                    file_type
-                )
+                rows
             )
         
-        logger.info(f"Updated processing state for {file_path} (user_id={user_id})")
+        for file_path, _, user_id, _, _, _ in rows:
+            logger.info(f"Updated processing state for {file_path} (user_id={user_id})")
@@ -29,6 +29,59 @@ from backend.models import QueryResult
 
 logger = logging.getLogger(__name__)
 
+# Store name patterns, compiled once and tried in order.
+# Strategy: Look for capitalized words (English) or Hangul (Korean) in specific contexts
+STORE_PATTERNS = [re.compile(pattern) for pattern in (
+    # English patterns
+    # Pattern 1: "at <Store>" - captures store name after "at"
+    r'\bat\s+([A-Z][A-Za-z\s&]+?)(?:\s+(?:store|receipts?|purchases?|transactions?)|[,.\?!]|$)',
+    # Pattern 2: "from <Store>" - captures store name after "from"
+    r'\bfrom\s+([A-Z][A-Za-z\s&]+?)(?:\s+(?:store|receipts?|purchases?|transactions?)|[,.\?!]|$)',
+    # Pattern 3: "in <Store>" - captures store name after "in"
+    r'\bin\s+([A-Z][A-Za-z\s&]+?)(?:\s+(?:store|receipts?|purchases?|transactions?)|[,.\?!]|$)',
+    # Pattern 4: "<Store> receipts/purchases/transactions"
+    # Match one or more capitalized words immediately before these keywords
+    r'\b([A-Z][A-Za-z]*(?:\s+[A-Z&][A-Za-z]*)*)\s+(?:receipts?|purchases?|transactions?)\b',
+    
+    # Korean patterns
+    # Pattern 5: "<Store>에서" or "<Store>에" (at/from Store)
+    # Match Hangul characters followed by 에서 or 에, but not if preceded by 월 (month)
+    r'(?:^|[^월])([\uac00-\ud7a3]{2,}(?:\s+[\uac00-\ud7a3]+)*)(?:에서|에)(?=\s|$|[^\uac00-\ud7a3])',
+    # Pattern 6: "<Store> 영수증" (Store receipt)
+    r'([\uac00-\ud7a3]{2,}(?:\s+[\uac00-\ud7a3]+)*)\s*영수증',
+)]
+
+# YYYY-MM-DD
+ISO_DATE_PATTERN = re.compile(r'\b(\d{4})-(\d{1,2})-(\d{1,2})\b')
+
+MONTH_NAMES = {
+    'january': 1, 'jan': 1,
+    'february': 2, 'feb': 2,
+    'march': 3, 'mar': 3,
+    'april': 4, 'apr': 4,
+    'may': 5,
+    'june': 6, 'jun': 6,
+    'july': 7, 'jul': 7,
+    'august': 8, 'aug': 8,
+    'september': 9, 'sep': 9, 'sept': 9,
+    'october': 10, 'oct': 10,
+    'november': 11, 'nov': 11,
+    'december': 12, 'dec': 12
+}
+
+# (month number, "month DD, YYYY" pattern, "month DD" pattern), in MONTH_NAMES order
+MONTH_DATE_PATTERNS = [
+    (
+        month_num,
+        re.compile(rf'\b{month_name}\s+(\d{{1,2}}),?\s+(\d{{4}})\b'),
+        re.compile(rf'\b{month_name}\s+(\d{{1,2}})\b'),
+    )
+    for month_name, month_num in MONTH_NAMES.items()
+]
+
+# Korean Unicode ranges: Hangul Syllables (AC00-D7AF), Hangul Jamo (1100-11FF)
+KOREAN_PATTERN = re.compile(r'[\uac00-\ud7af\u1100-\u11ff]+')
+
 
 class QueryEngine:
     """
@@ -340,35 +393,12 @@ class QueryEngine:
         Returns:
             Dictionary of metadata filters in ChromaDB format, or None if no filters detected
         """
-        import re
-        
         filters = {}
         
         # Extract store name using regex patterns
-        # Strategy: Look for capitalized words (English) or Hangul (Korean) in specific contexts
-        store_patterns = [
-            # English patterns
-            # Pattern 1: "at <Store>" - captures store name after "at"
-            r'\bat\s+([A-Z][A-Za-z\s&]+?)(?:\s+(?:store|receipts?|purchases?|transactions?)|[,.\?!]|$)',
-            # Pattern 2: "from <Store>" - captures store name after "from"
-            r'\bfrom\s+([A-Z][A-Za-z\s&]+?)(?:\s+(?:store|receipts?|purchases?|transactions?)|[,.\?!]|$)',
-            # Pattern 3: "in <Store>" - captures store name after "in"
-            r'\bin\s+([A-Z][A-Za-z\s&]+?)(?:\s+(?:store|receipts?|purchases?|transactions?)|[,.\?!]|$)',
-            # Pattern 4: "<Store> receipts/purchases/transactions"
-            # Match one or more capitalized words immediately before these keywords
-            r'\b([A-Z][A-Za-z]*(?:\s+[A-Z&][A-Za-z]*)*)\s+(?:receipts?|purchases?|transactions?)\b',
-            
-            # Korean patterns
-            # Pattern 5: "<Store>에서" or "<Store>에" (at/from Store)
-            # Match Hangul characters followed by 에서 or 에, but not if preceded by 월 (month)
-            r'(?:^|[^월])([\uac00-\ud7a3]{2,}(?:\s+[\uac00-\ud7a3]+)*)(?:에서|에)(?=\s|$|[^\uac00-\ud7a3])',
-            # Pattern 6: "<Store> 영수증" (Store receipt)
-            r'([\uac00-\ud7a3]{2,}(?:\s+[\uac00-\ud7a3]+)*)\s*영수증',
-        ]
-        
         store_name = None
-        for pattern in store_patterns:
-            match = re.search(pattern, question)
+        for pattern in STORE_PATTERNS:
+            match = pattern.search(question)
             if match:
                 candidate = match.group(1).strip()
                 
@@ -447,39 +477,21 @@ class QueryEngine:
         question_lower = question.lower()
         
         # Pattern 1: YYYY-MM-DD
-        pattern1 = r'\b(\d{4})-(\d{1,2})-(\d{1,2})\b'
-        match = re.search(pattern1, question)
+        match = ISO_DATE_PATTERN.search(question)
         if match:
             year, month, day = match.groups()
             return (f"{year}-{int(month):02d}-{int(day):02d}", False)
         
         # Pattern 2: MMM DD, YYYY or Month DD, YYYY
-        month_names = {
-            'january': 1, 'jan': 1,
-            'february': 2, 'feb': 2,
-            'march': 3, 'mar': 3,
-            'april': 4, 'apr': 4,
-            'may': 5,
-            'june': 6, 'jun': 6,
-            'july': 7, 'jul': 7,
-            'august': 8, 'aug': 8,
-            'september': 9, 'sep': 9, 'sept': 9,
-            'october': 10, 'oct': 10,
-            'november': 11, 'nov': 11,
-            'december': 12, 'dec': 12
-        }
-        
-        for month_name, month_num in month_names.items():
+        for month_num, pattern, pattern_no_year in MONTH_DATE_PATTERNS:
             # Pattern with year: "month DD, YYYY" or "month DD YYYY"
-            pattern = rf'\b{month_name}\s+(\d{{1,2}}),?\s+(\d{{4}})\b'
-            match = re.search(pattern, question_lower)
+            match = pattern.search(question_lower)
             if match:
                 day, year = match.groups()
                 return (f"{year}-{month_num:02d}-{int(day):02d}", False)
             
             # Pattern without year: "month DD" (default to current year, mark as ambiguous)
-            pattern_no_year = rf'\b{month_name}\s+(\d{{1,2}})\b'
-            match = re.search(pattern_no_year, question_lower)
+            match = pattern_no_year.search(question_lower)
             if match:
                 day = match.group(1)
                 # Default to current year (2026 based on system date)
@@ -500,10 +512,7 @@ class QueryEngine:
         Returns:
             True if text contains Korean characters, False otherwise
         """
-        # Korean Unicode ranges: Hangul Syllables (AC00-D7AF), Hangul Jamo (1100-11FF)
-        import re
-        korean_pattern = re.compile(r'[\uac00-\ud7af\u1100-\u11ff]+')
-        return bool(korean_pattern.search(text))
+        return bool(KOREAN_PATTERN.search(text))
     
     def _translate_to_korean(self, english_text: str, amount: Optional[float] = None, metadata: Optional[Dict[str, Any]] = None) -> str:
         """
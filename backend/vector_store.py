@@ -11,12 +11,55 @@ from typing import List, Dict, Optional, Any
 import logging
 import os
 from pathlib import Path
+import unicodedata
 import uuid
 
 from backend.models import DocumentChunk, QueryResult
 
 logger = logging.getLogger(__name__)
 
+# Metadata for newly created collections. ChromaDB searches an HNSW graph;
+# cosine space matches the 1 - distance scoring in query(), and the graph
+# settings trade a little build time for better recall at query time.
+COLLECTION_METADATA = {
+    "description": "Document chunks with embeddings for RAG chatbot",
+    "hnsw:space": "cosine",
+    "hnsw:M": 32,
+    "hnsw:construction_ef": 100,
+    "hnsw:search_ef": 64,
+}
+
+# Store name spellings that refer to the same business, mapped to one key.
+# Any normalized store name containing an alias is stored under its key.
+STORE_NAME_ALIASES = {
+    "코스트코": "costco",
+    "costco": "costco",
+}
+
+# Chunks read per page when backfilling metadata
+BACKFILL_PAGE_SIZE = 1000
+
+
+def normalize_store_name(store: str) -> str:
+    """
+    Normalize a store name into the key stored as "store_norm" metadata.
+    
+    Applies NFKC normalization, case folding and whitespace collapsing, then
+    maps known aliases (e.g., "코스트코", "Costco Wholesale") to one key so a
+    store filter can use an exact-match lookup.
+    
+    Args:
+        store: Store name as extracted from a document or a question
+        
+    Returns:
+        Normalized store key
+    """
+    normalized = " ".join(unicodedata.normalize("NFKC", store).casefold().split())
+    for alias, canonical in STORE_NAME_ALIASES.items():
+        if alias in normalized:
+            return canonical
+    return normalized
+
 
 class VectorStore:
     """
@@ -58,7 +101,7 @@ class VectorStore:
         # Get or create collection
         self.collection = self.client.get_or_create_collection(
             name=self.collection_name,
-            metadata={"description": "Document chunks with embeddings for RAG chatbot"}
+            metadata=dict(COLLECTION_METADATA)
         )
         
         logger.info(f"Vector store initialized with collection: {self.collection_name}")
@@ -129,7 +172,8 @@ class VectorStore:
             metadatas=metadatas
         )
         
-        logger.info(f"Successfully added {len(ids)} chunks. Total documents: {self.collection.count()}")
+        # No collection.count() here: it is a separate query on every add (once per image file)
+        logger.info(f"Successfully added {len(ids)} chunks")
     
     def _prepare_metadata(self, metadata: Dict[str, Any]) -> Dict[str, Any]:
         """
@@ -158,6 +202,10 @@ class VectorStore:
                 # Convert other types to string
                 cleaned[key] = str(value)
         
+        # Indexed equality key for store filters (see _build_where_clause)
+        if isinstance(cleaned.get('store'), str) and cleaned['store'].strip():
+            cleaned['store_norm'] = normalize_store_name(cleaned['store'])
+        
         return cleaned
     
     def query(
@@ -181,8 +229,9 @@ class VectorStore:
             logger.warning("Empty query embedding provided")
             return []
         
-        # Check if collection is empty
-        if self.collection.count() == 0:
+        # Check if collection is empty (count once; each call is a database round-trip)
+        total_chunks = self.collection.count()
+        if total_chunks == 0:
             logger.warning("Vector store is empty, no results to return")
             return []
         
@@ -196,7 +245,7 @@ class VectorStore:
         # Query ChromaDB
         results = self.collection.query(
             query_embeddings=[query_embedding],
-            n_results=min(top_k, self.collection.count()),
+            n_results=min(top_k, total_chunks),
             where=where_clause,
             include=["documents", "metadatas", "distances"]
         )
@@ -229,8 +278,8 @@ class VectorStore:
         """
         Build ChromaDB where clause from metadata filter.
         
-        Uses contains match for store names (to handle "코스트코" matching "Costco Wholesale")
-        and exact match for other fields.
+        Store names are matched on the normalized "store_norm" key (so "코스트코"
+        matches "Costco Wholesale") and other fields use exact match.
         
         Args:
             metadata_filter: Dictionary of metadata filters
@@ -238,17 +287,17 @@ class VectorStore:
         Returns:
             ChromaDB where clause
         """
-        # ChromaDB where clause format: {"field": {"$eq": "value"}} or {"field": {"$contains": "value"}}
+        # ChromaDB where clause format: {"field": {"$eq": "value"}}
         # For multiple conditions, use {"$and": [condition1, condition2]}
         
         conditions = []
         
         for key, value in metadata_filter.items():
             if value is not None:
-                # Use contains match for store field to handle partial matches
-                # (e.g., "코스트코" should match "Costco Wholesale")
+                # Match stores on the normalized key with an exact (indexed) lookup
+                # instead of scanning every row's store string
                 if key == 'store':
-                    conditions.append({key: {"$contains": value}})
+                    conditions.append({"store_norm": {"$eq": normalize_store_name(str(value))}})
                 else:
                     # Use exact match for other fields
                     conditions.append({key: {"$eq": value}})
@@ -394,6 +443,52 @@ class VectorStore:
             logger.error(f"Error deleting chunks for user {user_id}: {e}")
             raise
     
+    def backfill_store_norm(self, page_size: int = BACKFILL_PAGE_SIZE) -> int:
+        """
+        Add the "store_norm" key to existing chunks that have a store but no key yet.
+        
+        Chunks added before store_norm existed are invisible to store filters
+        until this runs (or they are reprocessed).
+        
+        Args:
+            page_size: Number of chunks to read and update per request
+            
+        Returns:
+            Number of chunks updated
+            
+        Raises:
+            RuntimeError: If vector store is in read-only mode
+        """
+        if self.read_only:
+            raise RuntimeError("Cannot update chunks: Vector store is in read-only mode")
+        
+        updated = 0
+        offset = 0
+        while True:
+            page = self.collection.get(include=["metadatas"], limit=page_size, offset=offset)
+            ids = page['ids']
+            if not ids:
+                break
+            
+            update_ids = []
+            update_metadatas = []
+            for chunk_id, metadata in zip(ids, page['metadatas']):
+                store = (metadata or {}).get('store')
+                if isinstance(store, str) and store.strip() and 'store_norm' not in metadata:
+                    update_ids.append(chunk_id)
+                    update_metadatas.append({**metadata, 'store_norm': normalize_store_name(store)})
+            
+            if update_ids:
+                self.collection.update(ids=update_ids, metadatas=update_metadatas)
+                updated += len(update_ids)
+            
+            if len(ids) < page_size:
+                break
+            offset += page_size
+        
+        logger.info(f"Backfilled store_norm for {updated} chunks")
+        return updated
+    
     def get_stats(self) -> Dict[str, Any]:
         """
         Get statistics about the vector store.
@@ -525,7 +620,7 @@ class VectorStore:
         self.client.delete_collection(name=self.collection_name)
         self.collection = self.client.create_collection(
             name=self.collection_name,
-            metadata={"description": "Document chunks with embeddings for RAG chatbot"}
+            metadata=dict(COLLECTION_METADATA)
         )
         logger.info("Vector store reset complete")
 
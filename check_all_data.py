@@ -1,3 +1,5 @@
+import sys
+
 import chromadb
 from chromadb.config import Settings
 
@@ -30,11 +32,13 @@ for i, doc_id in enumerate(results['ids']):
 
 print(f"Unique files: {len(files)}\n")
 
-# Show all files with their metadata
+# Show all files with their metadata (buffered into a single write)
+out = []
 for filename, metadata in sorted(files.items()):
-    print(f"{filename}")
-    print(f"  All metadata:")
+    out.append(f"{filename}")
+    out.append(f"  All metadata:")
     for key, value in sorted(metadata.items()):
         if not key.startswith('_'):  # Skip internal fields
-            print(f"    {key}: {value}")
-    print()
+            out.append(f"    {key}: {value}")
+    out.append("")
+sys.stdout.write("\n".join(out) + "\n")
@@ -1,26 +1,33 @@
 #!/usr/bin/env python3
 """Check what's actually in the vector store."""
 
+import sys
+from itertools import islice
+
 from backend.vector_store import get_vector_store
 
 vs = get_vector_store()
 results = vs.collection.get(limit=10, include=['metadatas', 'documents'])
 
-print(f'Total chunks: {len(results["ids"])}')
-print('\nChunk contents:')
+print(f'Total chunks: {vs.collection.count()}')
+
+# Collect the report and emit it with a single write
+out = ['\nChunk contents:']
 
 for i, (doc, meta) in enumerate(zip(results['documents'], results['metadatas'])):
-    print(f'\n--- Chunk {i+1} ---')
-    print(f'File: {meta.get("filename", "unknown")}')
-    print(f'File type: {meta.get("file_type", "N/A")}')
+    out.append(f'\n--- Chunk {i+1} ---')
+    out.append(f'File: {meta.get("filename", "unknown")}')
+    out.append(f'File type: {meta.get("file_type", "N/A")}')
     
     # Show all metadata fields dynamically
-    print(f'Metadata fields: {", ".join(meta.keys())}')
+    out.append(f'Metadata fields: {", ".join(meta.keys())}')
     
     # Show a few sample metadata values (first 5 non-internal fields)
-    sample_fields = [k for k in meta.keys() if not k.startswith('_')][:5]
+    sample_fields = islice((k for k in meta if not k.startswith('_')), 5)
     for field in sample_fields:
-        print(f'  {field}: {meta.get(field, "N/A")}')
+        out.append(f'  {field}: {meta.get(field, "N/A")}')
     
-    print(f'Content preview: {doc[:300]}')
-    print('...')
+    out.append(f'Content preview: {doc[:300]}')
+    out.append('...')
+
+sys.stdout.write('\n'.join(out) + '\n')
@@ -0,0 +1,20 @@
+"""
+Add the normalized store_norm key to chunks indexed before it existed.
+
+Store filters match on store_norm, so older chunks are not found by
+store-specific questions until this runs (or they are reprocessed).
+
+Usage:
+    python scripts/backfill_store_norm.py
+"""
+import sys
+from pathlib import Path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from backend.vector_store import get_vector_store
+
+vector_store = get_vector_store()
+
+print("Backfilling store_norm metadata...")
+updated = vector_store.backfill_store_norm()
+print(f"✓ Updated {updated} chunks")
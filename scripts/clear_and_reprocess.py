@@ -13,6 +13,8 @@ import sys
 import os
 from pathlib import Path
 
+from tqdm import tqdm
+
 # Add backend to path
 sys.path.insert(0, str(Path(__file__).parent))
 
@@ -71,9 +73,11 @@ def main():
     # Step 3: Process each image
     print("\n[3/3] Processing images with fixed vision extraction...")
     
-    for i, image_path in enumerate(image_files, 1):
-        print(f"\n[{i}/{len(image_files)}] Processing: {image_path.name}")
-        
+    succeeded = 0
+    failed = 0
+    total_chunks = 0
+    
+    for image_path in tqdm(image_files, desc="Processing", unit="image"):
         try:
             # Process image (uses max_list_items=5 fix)
             folder_path = str(image_path.parent.relative_to(Path.cwd()))
@@ -83,13 +87,15 @@ def main():
             )
             
             if result['status'] == 'success':
-                print(f"  ✓ Extracted {len(result.get('metadata', {}))} metadata fields")
-                print(f"  ✓ Created {result.get('chunks_created', 0)} chunks")
+                succeeded += 1
+                total_chunks += result.get('chunks_created', 0)
             else:
-                print(f"  ✗ Failed: {result.get('error', 'Unknown error')}")
+                failed += 1
+                tqdm.write(f"  ✗ {image_path.name}: {result.get('error', 'Unknown error')}")
         
         except Exception as e:
-            print(f"  ✗ Error: {e}")
+            failed += 1
+            tqdm.write(f"  ✗ {image_path.name}: {e}")
             continue
     
     # Final stats
@@ -97,6 +103,7 @@ def main():
     print("PROCESSING COMPLETE")
     print("=" * 60)
     final_count = vector_store.collection.count()
+    print(f"Succeeded: {succeeded}, failed: {failed}, chunks created: {total_chunks}")
     print(f"Total chunks in vector store: {final_count}")
     print("\nYou can now test queries with clean data!")
 
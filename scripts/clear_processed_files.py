@@ -1,4 +1,10 @@
-"""Clear processed files records to force reprocessing."""
+"""Clear processed files records to force reprocessing.
+
+Usage:
+    python scripts/clear_processed_files.py          # DELETE all rows
+    python scripts/clear_processed_files.py --all    # DROP and recreate the table
+"""
+import argparse
 import sys
 from pathlib import Path
 sys.path.insert(0, str(Path(__file__).parent.parent))
@@ -6,12 +12,34 @@ sys.path.insert(0, str(Path(__file__).parent.parent))
 from backend.database import DatabaseManager
 from backend.config import Config
 
+parser = argparse.ArgumentParser(description="Clear processed files records")
+parser.add_argument(
+    "--all",
+    action="store_true",
+    help="Drop and recreate the processed_files table instead of deleting row by row"
+)
+args = parser.parse_args()
+
 db = DatabaseManager(db_path=Config.SQLITE_PATH)
 
 with db.transaction() as conn:
     cursor = conn.cursor()
-    cursor.execute("DELETE FROM processed_files")
-    count = cursor.rowcount
+    if args.all:
+        # DROP frees the table's pages in one step instead of journaling every row
+        cursor.execute("SELECT COUNT(*) FROM processed_files")
+        count = cursor.fetchone()[0]
+        cursor.execute("DROP TABLE processed_files")
+    else:
+        cursor.execute("DELETE FROM processed_files")
+        count = cursor.rowcount
     print(f"Deleted {count} processed file records")
 
+if args.all:
+    # Recreate processed_files (and its index) from the canonical schema
+    db._init_schema()
+
+# Fold the WAL back into the main database so the next process doesn't replay it
+with db.transaction() as conn:
+    conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+
 print("Done! Files will be reprocessed on next run.")
@@ -16,67 +16,136 @@ sys.path.insert(0, str(Path(__file__).parent.parent))
 
 from backend.config import Config
 
+def has_column(cursor, table, column):
+    """Check whether a table has a column, filtering inside SQLite."""
+    cursor.execute(
+        "SELECT 1 FROM pragma_table_info(?) WHERE name = ? LIMIT 1",
+        (table, column)
+    )
+    return cursor.fetchone() is not None
+
+def has_single_column_unique(cursor, table, column):
+    """
+    Check whether a table enforces UNIQUE on one column by itself.
+    
+    Such a constraint can't be widened in place to include user_id, so the
+    table has to be rebuilt instead of altered.
+    """
+    cursor.execute(f"PRAGMA index_list({table})")
+    for index in cursor.fetchall():
+        if not index["unique"]:
+            continue
+        cursor.execute(f"PRAGMA index_info({index['name']})")
+        if [row["name"] for row in cursor.fetchall()] == [column]:
+            return True
+    return False
+
 def migrate():
     """Run the migration."""
     db_path = Config.SQLITE_PATH
     
     print(f"Migrating database: {db_path}")
     
-    conn = sqlite3.connect(db_path)
+    # Autocommit mode: the migration manages its own transaction below
+    conn = sqlite3.connect(db_path, isolation_level=None)
     conn.row_factory = sqlite3.Row
     cursor = conn.cursor()
     
+    # WAL avoids journaling every copied page twice; temp_store keeps the
+    # INSERT ... SELECT scratch space off disk
+    cursor.executescript("""
+        PRAGMA journal_mode=WAL;
+        PRAGMA synchronous=NORMAL;
+        PRAGMA temp_store=MEMORY;
+        PRAGMA cache_size=-262144;
+    """)
+    
     try:
         # Check if user_id column already exists
-        cursor.execute("PRAGMA table_info(folders)")
-        columns = [row[1] for row in cursor.fetchall()]
-        
-        if 'user_id' in columns:
+        if has_column(cursor, "folders", "user_id"):
             print("✓ Migration already applied - user_id column exists")
             return
         
         print("Starting migration...")
         
-        # Step 1: Create new folders table with user_id
-        print("1. Creating new folders table...")
-        cursor.execute("""
-            CREATE TABLE folders_new (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                path TEXT NOT NULL,
-                user_id INTEGER NOT NULL,
-                added_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                FOREIGN KEY (user_id) REFERENCES users(id) ON DELETE CASCADE,
-                UNIQUE(path, user_id)
-            )
-        """)
+        # Run every step (DDL included) in one transaction so a failure
+        # leaves the original tables untouched
+        cursor.execute("BEGIN IMMEDIATE")
         
-        # Step 2: Copy existing data, assigning all folders to user 1 (Harry)
-        print("2. Copying existing folders (assigning to user 1 - Harry)...")
-        cursor.execute("""
-            INSERT INTO folders_new (id, path, user_id, added_at)
-            SELECT id, path, 1, added_at
-            FROM folders
-        """)
+        cursor.execute("SELECT COUNT(*) FROM folders")
+        folder_count = cursor.fetchone()[0]
         
-        rows_copied = cursor.rowcount
-        print(f"   Copied {rows_copied} folders")
-        
-        # Step 3: Drop old table
-        print("3. Dropping old folders table...")
-        cursor.execute("DROP TABLE folders")
-        
-        # Step 4: Rename new table
-        print("4. Renaming new table...")
-        cursor.execute("ALTER TABLE folders_new RENAME TO folders")
+        if not has_single_column_unique(cursor, "folders", "path"):
+            # Fast path: add the column in place instead of rewriting the table
+            print("1. Adding user_id column (assigning to user 1 - Harry)...")
+            cursor.execute("""
+                ALTER TABLE folders
+                ADD COLUMN user_id INTEGER NOT NULL DEFAULT 1
+                REFERENCES users(id) ON DELETE CASCADE
+            """)
+            
+            print("2. Creating UNIQUE index on (path, user_id)...")
+            cursor.execute("""
+                CREATE UNIQUE INDEX IF NOT EXISTS idx_folders_path_user
+                ON folders(path, user_id)
+            """)
+            print(f"   Assigned {folder_count} folders")
+        else:
+            # UNIQUE(path) is part of the table definition, so rebuild
+            # Step 1: Create new folders table with user_id
+            print("1. Creating new folders table...")
+            cursor.execute("""
+                CREATE TABLE folders_new (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    path TEXT NOT NULL,
+                    user_id INTEGER NOT NULL,
+                    added_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                    FOREIGN KEY (user_id) REFERENCES users(id) ON DELETE CASCADE,
+                    UNIQUE(path, user_id)
+                )
+            """)
+            
+            # Step 2: Copy existing data, assigning all folders to user 1 (Harry)
+            print("2. Copying existing folders (assigning to user 1 - Harry)...")
+            cursor.execute("""
+                INSERT INTO folders_new (id, path, user_id, added_at)
+                SELECT id, path, 1, added_at
+                FROM folders
+            """)
+            print(f"   Copied {cursor.rowcount} folders")
+            
+            # Step 3: Drop old table
+            print("3. Dropping old folders table...")
+            cursor.execute("DROP TABLE folders")
+            
+            # Step 4: Rename new table
+            print("4. Renaming new table...")
+            cursor.execute("ALTER TABLE folders_new RENAME TO folders")
         
         # Step 5: Update processed_files if needed
         print("5. Checking processed_files table...")
-        cursor.execute("PRAGMA table_info(processed_files)")
-        pf_columns = [row[1] for row in cursor.fetchall()]
+        pf_has_user_id = has_column(cursor, "processed_files", "user_id")
         
-        if 'user_id' not in pf_columns:
+        if not pf_has_user_id and not has_single_column_unique(cursor, "processed_files", "file_path"):
+            print("   Adding user_id to processed_files...")
+            cursor.execute("""
+                ALTER TABLE processed_files
+                ADD COLUMN user_id INTEGER NOT NULL DEFAULT 1
+                REFERENCES users(id) ON DELETE CASCADE
+            """)
+            
+            # Replaces the old path index and serves the
+            # ON CONFLICT(file_path, user_id) upserts
+            cursor.execute("DROP INDEX IF EXISTS idx_processed_files_path")
+            cursor.execute("""
+                CREATE UNIQUE INDEX idx_processed_files_path 
+                ON processed_files(file_path, user_id)
+            """)
+            
+            print("   ✓ Updated processed_files table")
+        elif not pf_has_user_id:
             print("   Adding user_id to processed_files...")
-            # This is more complex - need to recreate table
+            # UNIQUE(file_path) is part of the table definition, so rebuild
             cursor.execute("""
                 CREATE TABLE processed_files_new (
                     id INTEGER PRIMARY KEY AUTOINCREMENT,
@@ -119,7 +188,7 @@ def migrate():
         print("\n✅ Migration completed successfully!")
         print("\nSummary:")
         print(f"  - Folders table updated with user_id column")
-        print(f"  - {rows_copied} existing folders assigned to user 1 (Harry)")
+        print(f"  - {folder_count} existing folders assigned to user 1 (Harry)")
         print(f"  - UNIQUE constraint updated to (path, user_id)")
         print("\nNote: All existing folders are now owned by Harry (user_id=1)")
         print("You can reassign folders to other users through the UI")
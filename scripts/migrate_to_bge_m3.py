@@ -13,17 +13,66 @@ Why bge-m3?
 - Specifically designed for multilingual semantic search
 """
 
+import argparse
+import os
+import queue
 import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from pathlib import Path
 
-# Add backend to path
-sys.path.insert(0, str(Path(__file__).parent))
+from tqdm import tqdm
+
+# Add project root to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
 
 from backend.vector_store import get_vector_store
 from backend.document_processor import DocumentProcessor
+from backend.database import DatabaseManager
+from backend.folder_manager import FolderManager
+from backend.processing_state import ProcessingStateManager
+from backend.embedding_engine import get_embedding_engine
+from backend.image_processor import ImageProcessor
 from backend.config import Config
 
+# Number of chunks sent to the embedding model per batch
+EMBED_BATCH_SIZE = 64
+
+# Extracted chunks held back and sorted by length before being cut into
+# embedding batches, so each batch holds texts of similar length
+BUCKET_POOL_SIZE = EMBED_BATCH_SIZE * 8
+
+# Pools/batches allowed to wait between pipeline stages before the
+# upstream stage blocks
+STAGE_QUEUE_SIZE = 4
+
+# Chunks read per page when listing what the vector store already holds
+RESUME_PAGE_SIZE = 1000
+
+# Default number of images extracted concurrently
+DEFAULT_WORKERS = min(4, os.cpu_count() or 1)
+
 def main():
+    parser = argparse.ArgumentParser(description="Migrate the vector store to bge-m3 embeddings")
+    parser.add_argument(
+        "--user-id",
+        type=int,
+        default=1,
+        help="User ID to tag the reprocessed documents with (default: 1)"
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=DEFAULT_WORKERS,
+        help=f"Number of images to extract concurrently (default: {DEFAULT_WORKERS})"
+    )
+    parser.add_argument(
+        "--resume",
+        action="store_true",
+        help="Keep the vector store and skip images that already have chunks in it"
+    )
+    args = parser.parse_args()
+    
     print("=" * 80)
     print("MIGRATE TO BGE-M3 EMBEDDING MODEL")
     print("=" * 80)
@@ -51,7 +100,22 @@ def main():
     current_count = vector_store.collection.count()
     print(f"Current document count: {current_count}")
     
-    if current_count > 0:
+    embedding_engine = get_embedding_engine(model_name="bge-m3")
+    
+    if args.resume and current_count > 0:
+        # Resume skips images by filename only, so the stored chunks must
+        # already be bge-m3 vectors or the old embedding space would be kept
+        stored_dimension = vector_store.get_embedding_dimension()
+        expected_dimension = embedding_engine.get_embedding_dimension()
+        if stored_dimension != expected_dimension:
+            print(f"✗ Cannot resume: stored embeddings are {stored_dimension}-dim, "
+                  f"bge-m3 produces {expected_dimension}-dim")
+            print("  The vector store still holds another model's vectors. Run without --resume.")
+            return
+        print("✓ Resuming - keeping existing chunks")
+    elif args.resume:
+        print("✓ Resuming - vector store is empty")
+    elif current_count > 0:
         vector_store.reset()
         print("✓ Vector store cleared")
     else:
@@ -82,31 +146,138 @@ def main():
     
     print(f"Found {len(image_files)} images to process")
     
+    if args.resume:
+        # Extraction and embedding are the expensive steps; skip any image
+        # whose chunks an earlier (interrupted) run already stored
+        embedded = set()
+        offset = 0
+        while True:
+            page = vector_store.collection.get(
+                where={"user_id": args.user_id},
+                include=["metadatas"],
+                limit=RESUME_PAGE_SIZE,
+                offset=offset
+            )
+            embedded.update(
+                (meta.get('folder_path'), meta.get('filename'))
+                for meta in page['metadatas']
+            )
+            if len(page['ids']) < RESUME_PAGE_SIZE:
+                break
+            offset += RESUME_PAGE_SIZE
+        
+        remaining = [p for p in image_files if (str(p.parent), p.name) not in embedded]
+        print(f"Skipping {len(image_files) - len(remaining)} images already in the vector store")
+        image_files = remaining
+    
     if len(image_files) == 0:
         print("No images found.")
         return
     
-    # Process each image
-    processor = DocumentProcessor()
+    # Build the processing pipeline with bge-m3 embeddings
+    db_manager = DatabaseManager(db_path=Config.SQLITE_PATH)
+    processor = DocumentProcessor(
+        db_manager=db_manager,
+        folder_manager=FolderManager(db_manager),
+        state_manager=ProcessingStateManager(db_manager),
+        embedding_engine=embedding_engine,
+        vector_store=vector_store,
+        image_processor=ImageProcessor()
+    )
     
-    for i, image_path in enumerate(image_files, 1):
-        print(f"\n[{i}/{len(image_files)}] Processing: {image_path.name}")
-        
-        try:
-            folder_path = str(image_path.parent.relative_to(Path.cwd()))
-            result = processor.process_document(
-                file_path=str(image_path),
-                folder_path=folder_path
-            )
+    # Three overlapping stages: extraction on the worker pool, embedding on
+    # one thread and ChromaDB writes on another, linked by bounded queues.
+    # None is passed down the queues to signal the end of input.
+    embed_queue = queue.Queue(maxsize=STAGE_QUEUE_SIZE)
+    store_queue = queue.Queue(maxsize=STAGE_QUEUE_SIZE)
+    stored = 0
+    
+    def embed_stage():
+        """Sort each pool by word count and embed it in similar-length batches."""
+        while True:
+            pool = embed_queue.get()
+            if pool is None:
+                store_queue.put(None)
+                return
+            
+            pool.sort(key=lambda c: len(c.content.split()))
+            for start in range(0, len(pool), EMBED_BATCH_SIZE):
+                batch = pool[start:start + EMBED_BATCH_SIZE]
+                try:
+                    embeddings = embedding_engine.generate_embeddings_batch([c.content for c in batch])
+                except Exception as e:
+                    tqdm.write(f"  ✗ Embedding failed for {len(batch)} chunks: {e}")
+                    continue
+                
+                for chunk, embedding in zip(batch, embeddings):
+                    chunk.embedding = embedding
+                store_queue.put(batch)
+    
+    def store_stage():
+        """Add embedded batches to the vector store."""
+        nonlocal stored
+        while True:
+            batch = store_queue.get()
+            if batch is None:
+                return
             
-            if result['status'] == 'success':
-                print(f"  ✓ Created {result.get('chunks_created', 0)} chunks")
-            else:
-                print(f"  ✗ Failed: {result.get('error', 'Unknown error')}")
+            try:
+                vector_store.add_chunks(batch)
+                stored += len(batch)
+            except Exception as e:
+                tqdm.write(f"  ✗ Storing {len(batch)} chunks failed: {e}")
+    
+    stages = [
+        threading.Thread(target=embed_stage, name="embed", daemon=True),
+        threading.Thread(target=store_stage, name="store", daemon=True)
+    ]
+    for stage in stages:
+        stage.start()
+    
+    print(f"Extracting with {args.workers} workers, embedding in batches of {EMBED_BATCH_SIZE}...")
+    pending = []
+    extracted = 0
+    failures = []
+    with ThreadPoolExecutor(max_workers=args.workers) as executor:
+        futures = {
+            executor.submit(processor.extract_image_chunk, str(image_path), args.user_id): image_path
+            for image_path in image_files
+        }
         
-        except Exception as e:
-            print(f"  ✗ Error: {e}")
-            continue
+        # tqdm repaints at most ~10 times a second instead of printing per file
+        with tqdm(total=len(image_files), desc="Extracting", unit="image") as pbar:
+            for future in as_completed(futures):
+                image_path = futures[future]
+                pbar.set_postfix_str(image_path.name)
+                pbar.update(1)
+                
+                try:
+                    chunk = future.result()
+                except Exception as e:
+                    failures.append((image_path.name, str(e)))
+                    continue
+                
+                if chunk is None:
+                    failures.append((image_path.name, "no content extracted"))
+                    continue
+                
+                pending.append(chunk)
+                extracted += 1
+                
+                if len(pending) >= BUCKET_POOL_SIZE:
+                    embed_queue.put(pending)
+                    pending = []
+    
+    if pending:
+        embed_queue.put(pending)
+    embed_queue.put(None)
+    for stage in stages:
+        stage.join()
+    print(f"\n✓ Extracted {extracted} chunks, stored {stored}")
+    
+    if failures:
+        print(f"✗ {len(failures)} images failed:")
+        print("\n".join(f"  - {name}: {error}" for name, error in failures))
     
     # Final stats
     print("\n" + "=" * 80)
@@ -114,6 +285,8 @@ def main():
     print("=" * 80)
     final_count = vector_store.collection.count()
     print(f"Total chunks in vector store: {final_count}")
+    cache_info = embedding_engine.get_cache_info()
+    print(f"Embedding cache: {cache_info['hits']} hits, {cache_info['misses']} misses")
     print("\nNow test with: python test_embedding_scores.py")
 
 if __name__ == "__main__":
@@ -18,6 +18,30 @@ sys.path.insert(0, str(Path(__file__).parent.parent))
 
 from backend.config import Config
 
+def has_column(cursor, table, column):
+    """Check whether a table has a column, filtering inside SQLite."""
+    cursor.execute(
+        "SELECT 1 FROM pragma_table_info(?) WHERE name = ? LIMIT 1",
+        (table, column)
+    )
+    return cursor.fetchone() is not None
+
+def has_single_column_unique(cursor, table, column):
+    """
+    Check whether a table enforces UNIQUE on one column by itself.
+    
+    Such a constraint can't be widened in place to include user_id, so the
+    table has to be rebuilt instead of altered.
+    """
+    cursor.execute(f"PRAGMA index_list({table})")
+    for index in cursor.fetchall():
+        if not index["unique"]:
+            continue
+        cursor.execute(f"PRAGMA index_info({index['name']})")
+        if [row["name"] for row in cursor.fetchall()] == [column]:
+            return True
+    return False
+
 def migrate_database():
     """Run database migration to add multi-user support."""
     db_path = Config.SQLITE_PATH
@@ -33,11 +57,25 @@ def migrate_database():
     print("Backup created successfully")
     
     # Connect to database
-    conn = sqlite3.connect(db_path)
+    # Autocommit mode: the migration manages its own transaction below
+    conn = sqlite3.connect(db_path, isolation_level=None)
     conn.row_factory = sqlite3.Row
     cursor = conn.cursor()
     
+    # WAL avoids journaling every copied page twice; temp_store keeps the
+    # INSERT ... SELECT scratch space off disk
+    cursor.executescript("""
+        PRAGMA journal_mode=WAL;
+        PRAGMA synchronous=NORMAL;
+        PRAGMA temp_store=MEMORY;
+        PRAGMA cache_size=-262144;
+    """)
+    
     try:
+        # Run every step (DDL included) in one transaction so a failure
+        # leaves the original tables untouched
+        cursor.execute("BEGIN IMMEDIATE")
+        
         # Step 1: Create users table
         print("\n1. Creating users table...")
         cursor.execute("""
@@ -86,33 +124,14 @@ def migrate_database():
         print("\n3. Migrating conversations table...")
         
         # Check if user_id column already exists
-        cursor.execute("PRAGMA table_info(conversations)")
-        columns = [row[1] for row in cursor.fetchall()]
-        
-        if 'user_id' not in columns:
-            # Create new table with user_id
-            cursor.execute("""
-                CREATE TABLE conversations_new (
-                    id TEXT PRIMARY KEY,
-                    user_id INTEGER NOT NULL,
-                    title TEXT,
-                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                    FOREIGN KEY (user_id) REFERENCES users(id) ON DELETE CASCADE
-                )
-            """)
-            
-            # Copy data from old table, assigning all to Harry
+        if not has_column(cursor, "conversations", "user_id"):
+            # Add the column in place, assigning all existing rows to Harry
             cursor.execute(f"""
-                INSERT INTO conversations_new (id, user_id, title, created_at, updated_at)
-                SELECT id, {harry_id}, title, created_at, updated_at
-                FROM conversations
+                ALTER TABLE conversations
+                ADD COLUMN user_id INTEGER NOT NULL DEFAULT {harry_id}
+                REFERENCES users(id) ON DELETE CASCADE
             """)
             
-            # Drop old table and rename new one
-            cursor.execute("DROP TABLE conversations")
-            cursor.execute("ALTER TABLE conversations_new RENAME TO conversations")
-            
             # Create index
             cursor.execute("""
                 CREATE INDEX idx_conversations_user 
@@ -127,11 +146,27 @@ def migrate_database():
         print("\n4. Migrating processed_files table...")
         
         # Check if user_id column already exists
-        cursor.execute("PRAGMA table_info(processed_files)")
-        columns = [row[1] for row in cursor.fetchall()]
+        pf_has_user_id = has_column(cursor, "processed_files", "user_id")
         
-        if 'user_id' not in columns:
-            # Create new table with user_id
+        if not pf_has_user_id and not has_single_column_unique(cursor, "processed_files", "file_path"):
+            # Add the column in place, assigning all existing rows to Harry
+            cursor.execute(f"""
+                ALTER TABLE processed_files
+                ADD COLUMN user_id INTEGER NOT NULL DEFAULT {harry_id}
+                REFERENCES users(id) ON DELETE CASCADE
+            """)
+            
+            # Replaces the old path index and serves the
+            # ON CONFLICT(file_path, user_id) upserts
+            cursor.execute("DROP INDEX IF EXISTS idx_processed_files_path")
+            cursor.execute("""
+                CREATE UNIQUE INDEX idx_processed_files_path 
+                ON processed_files(file_path, user_id)
+            """)
+            
+            print("   Processed_files table migrated")
+        elif not pf_has_user_id:
+            # UNIQUE(file_path) is part of the table definition, so rebuild
             cursor.execute("""
                 CREATE TABLE processed_files_new (
                     id INTEGER PRIMARY KEY AUTOINCREMENT,
@@ -1,6 +1,7 @@
 #!/usr/bin/env python3
 """Reprocess all documents with the new qwen3-embedding model."""
 import sys
+import threading
 sys.path.insert(0, '.')
 
 from backend.config import Config
@@ -13,65 +14,145 @@ from backend.image_processor import ImageProcessor
 from backend.document_processor import DocumentProcessor
 from pathlib import Path
 
-# Initialize
-Config.ensure_data_directories()
+# Number of chunks buffered before a single bulk insert into ChromaDB
+WRITE_BATCH_SIZE = 256
 
-# Create all required components
-db_manager = DatabaseManager()
-folder_manager = FolderManager(db_manager)
-state_manager = ProcessingStateManager(db_manager)
-embedding_engine = get_embedding_engine()
-vector_store = get_vector_store()
-image_processor = ImageProcessor()
 
-# Create document processor
-processor = DocumentProcessor(
-    db_manager=db_manager,
-    folder_manager=folder_manager,
-    state_manager=state_manager,
-    embedding_engine=embedding_engine,
-    vector_store=vector_store,
-    image_processor=image_processor
-)
+class BufferedVectorStore:
+    """
+    Collects add_chunks calls and writes them to ChromaDB in bulk.
+    
+    Thread-safe: DocumentProcessor may call add_chunks from several image
+    workers (IMAGE_PROCESSING_WORKERS > 1) while another thread flushes.
+    """
+    
+    def __init__(self, vector_store, batch_size=WRITE_BATCH_SIZE):
+        self._store = vector_store
+        self.batch_size = batch_size
+        self.pending = []
+        self._lock = threading.Lock()
+    
+    def add_chunks(self, chunks):
+        with self._lock:
+            self.pending.extend(chunks)
+    
+    def flush(self):
+        # Hold the lock through the write so a concurrent state flush can't
+        # record files whose chunks are still being written
+        with self._lock:
+            batch, self.pending = self.pending, []
+            if batch:
+                self._store.add_chunks(batch)
+    
+    def __getattr__(self, name):
+        return getattr(self._store, name)
 
-# Get the test folder path
-test_folder = Path(r"C:\Users\harry\OneDrive\Desktop\testing")
 
-if not test_folder.exists():
-    print(f"Error: Test folder not found: {test_folder}")
-    sys.exit(1)
+class BufferedStateManager:
+    """
+    Collects processing state updates and writes them with one executemany.
+    
+    State rows are only written after the buffered chunks they describe have
+    been stored, so an interrupted run never marks a file as processed
+    without its chunks.
+    """
+    
+    def __init__(self, state_manager, chunk_buffer):
+        self._state = state_manager
+        self.chunk_buffer = chunk_buffer
+        self.pending = []
+        self._lock = threading.Lock()
+    
+    def update_file_state(self, file_path, folder_id, file_type, user_id):
+        # Validate and hash now so a bad file raises here, for this file,
+        # instead of failing a later flush for the whole batch
+        row = self._state.build_file_state_row(file_path, folder_id, file_type, user_id)
+        with self._lock:
+            self.pending.append(row)
+        if len(self.chunk_buffer.pending) >= self.chunk_buffer.batch_size:
+            self.flush()
+    
+    def flush(self):
+        with self._lock:
+            # Take the rows first: their chunks were added before them, so
+            # the chunk flush below stores every chunk these rows describe
+            batch, self.pending = self.pending, []
+            self.chunk_buffer.flush()
+            if batch:
+                self._state.write_file_states(batch)
+    
+    def __getattr__(self, name):
+        return getattr(self._state, name)
+
 
-print(f"Processing documents from: {test_folder}")
-print(f"Using embedding model: {Config.EMBEDDING_MODEL}")
-print(f"Embedding dimension: 4096 (qwen3-embedding:8b)")
-print()
+def main():
+    # Initialize
+    Config.ensure_data_directories()
+    
+    # Create all required components
+    db_manager = DatabaseManager()
+    folder_manager = FolderManager(db_manager)
+    state_manager = ProcessingStateManager(db_manager)
+    embedding_engine = get_embedding_engine()
+    vector_store = get_vector_store()
+    image_processor = ImageProcessor()
+    
+    # Buffer vector store writes and state updates so they go out in batches
+    buffered_store = BufferedVectorStore(vector_store)
+    buffered_state = BufferedStateManager(state_manager, buffered_store)
+    
+    # Create document processor
+    processor = DocumentProcessor(
+        db_manager=db_manager,
+        folder_manager=folder_manager,
+        state_manager=buffered_state,
+        embedding_engine=embedding_engine,
+        vector_store=buffered_store,
+        image_processor=image_processor
+    )
+    
+    # Get the test folder path
+    test_folder = Path(r"C:\Users\harry\OneDrive\Desktop\testing")
+    
+    if not test_folder.exists():
+        print(f"Error: Test folder not found: {test_folder}")
+        sys.exit(1)
+    
+    print(f"Processing documents from: {test_folder}")
+    print(f"Using embedding model: {Config.EMBEDDING_MODEL}")
+    print(f"Embedding dimension: 4096 (qwen3-embedding:8b)")
+    print()
+    
+    # Add the folder first
+    folder_id = folder_manager.add_folder(str(test_folder))
+    print(f"Added folder with ID: {folder_id}")
+    
+    # Process all folders
+    try:
+        result = processor.process_folders()
+        buffered_state.flush()
+        
+        print(f"\n{'='*60}")
+        print("Processing Complete!")
+        print(f"{'='*60}")
+        print(f"Total files processed: {result['total_files']}")
+        print(f"Successfully processed: {result['successful']}")
+        print(f"Failed: {result['failed']}")
+        print(f"Total chunks created: {result['total_chunks']}")
+        
+        if result['errors']:
+            print(f"\nErrors:")
+            print("\n".join(f"  - {error}" for error in result['errors']))
+        
+        print(f"\nDocuments are now embedded with qwen3-embedding:8b")
+        print(f"This model supports multilingual search (Korean + English)")
+    
+    except Exception as e:
+        print(f"Error processing documents: {e}")
+        import traceback
+        traceback.print_exc()
+        sys.exit(1)
 
-# Add the folder first
-folder_id = folder_manager.add_folder(str(test_folder))
-print(f"Added folder with ID: {folder_id}")
 
-# Process all folders
-try:
-    result = processor.process_folders()
-    
-    print(f"\n{'='*60}")
-    print("Processing Complete!")
-    print(f"{'='*60}")
-    print(f"Total files processed: {result['total_files']}")
-    print(f"Successfully processed: {result['successful']}")
-    print(f"Failed: {result['failed']}")
-    print(f"Total chunks created: {result['total_chunks']}")
-    
-    if result['errors']:
-        print(f"\nErrors:")
-        for error in result['errors']:
-            print(f"  - {error}")
-    
-    print(f"\nDocuments are now embedded with qwen3-embedding:8b")
-    print(f"This model supports multilingual search (Korean + English)")
-    
-except Exception as e:
-    print(f"Error processing documents: {e}")
-    import traceback
-    traceback.print_exc()
-    sys.exit(1)
+if __name__ == "__main__":
+    main()
@@ -2,12 +2,26 @@
 """Reprocess documents via API."""
 import requests
 import time
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+# One keep-alive session for every call; retries cover dropped connections
+# (POSTs are only retried when the connection failed before sending)
+session = requests.Session()
+session.mount(
+    "http://",
+    HTTPAdapter(
+        pool_connections=4,
+        pool_maxsize=16,
+        max_retries=Retry(total=3, backoff_factor=0.2)
+    )
+)
 
 # Folder path
 folder_path = r"C:\Users\harry\OneDrive\Desktop\testing"
 
 print("Step 1: Adding folder to watch list...")
-response = requests.post(
+response = session.post(
     "http://localhost:8000/api/folders/add",
     json={"path": folder_path}
 )
@@ -18,7 +32,7 @@ else:
     print(f"Error: {response.text}")
 
 print("\nStep 2: Processing documents...")
-response = requests.post(
+response = session.post(
     "http://localhost:8000/api/process/start"
 )
 print(f"Response: {response.status_code}")
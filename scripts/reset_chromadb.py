@@ -42,8 +42,17 @@ def main():
     backup_path = backup_dir / f"chromadb_backup_{timestamp}"
     
     try:
-        shutil.copytree(chromadb_path, backup_path)
-        print(f"✓ Backup created at: {backup_path}")
+        try:
+            # Hard links make the backup O(files) instead of O(bytes). The
+            # store is only ever removed below (rmtree unlinks names), never
+            # modified in place, so the linked files stay an intact snapshot.
+            shutil.copytree(chromadb_path, backup_path, copy_function=os.link)
+            print(f"✓ Backup created at: {backup_path} (hard links)")
+        except OSError:
+            # Hard links not possible (e.g. different filesystem) - copy bytes
+            shutil.rmtree(backup_path, ignore_errors=True)
+            shutil.copytree(chromadb_path, backup_path)
+            print(f"✓ Backup created at: {backup_path}")
     except Exception as e:
         print(f"✗ Backup failed: {e}")
         print("  Continuing anyway...")
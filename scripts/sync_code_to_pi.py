@@ -6,6 +6,9 @@ import sys
 import os
 from backend.config import Config
 
+# Reuse one SSH connection across rsync runs (and later ssh commands) for 60s
+SSH_COMMAND = "ssh -o ControlMaster=auto -o ControlPersist=60s -o ControlPath=~/.ssh/cm-%r@%h:%p"
+
 print("=== SYNCING CODE TO RASPBERRY PI ===\n")
 
 # Check configuration
@@ -26,6 +29,7 @@ try:
     result = subprocess.run(
         [
             "wsl", "-d", "Ubuntu", "--", "rsync", "-avz",
+            "-e", SSH_COMMAND,
             "--exclude", "__pycache__",
             "--exclude", "*.pyc",
             f"{wsl_path}/backend/",
@@ -6,6 +6,22 @@ import sys
 import os
 from backend.config import Config
 
+# Reuse one SSH connection across rsync runs (and later ssh commands) for 60s
+SSH_COMMAND = "ssh -o ControlMaster=auto -o ControlPersist=60s -o ControlPath=~/.ssh/cm-%r@%h:%p"
+
+def supports_zstd(command):
+    """Check whether the rsync started by command lists zstd compression."""
+    try:
+        result = subprocess.run(
+            command + ["rsync", "--version"],
+            capture_output=True,
+            text=True,
+            timeout=30
+        )
+    except Exception:
+        return False
+    return result.returncode == 0 and "zstd" in result.stdout
+
 print("=== SYNCING TO RASPBERRY PI ===\n")
 
 # Check configuration
@@ -23,52 +39,43 @@ current_dir = os.getcwd()
 wsl_path = current_dir.replace('\\', '/').replace('E:', '/mnt/e').replace('C:', '/mnt/c')
 print(f"Source: {wsl_path}/data/\n")
 
-# Sync ChromaDB
-print("Syncing ChromaDB vector store...")
-try:
-    result = subprocess.run(
-        [
-            "wsl", "-d", "Ubuntu", "--", "rsync", "-avz", "--delete",
-            f"{wsl_path}/data/chromadb/",
-            f"{Config.PI_HOST}:{Config.PI_PATH}chromadb/"
-        ],
-        capture_output=True,
-        text=True,
-        timeout=300
-    )
-    
-    if result.returncode == 0:
-        print("✓ ChromaDB synced successfully")
-    else:
-        print(f"❌ ChromaDB sync failed: {result.stderr}")
-        sys.exit(1)
-        
-except Exception as e:
-    print(f"❌ ChromaDB sync error: {e}")
-    sys.exit(1)
+# zlib (-z) is CPU-bound on the sender for the mostly incompressible HNSW
+# files; use zstd level 1 when both ends have it, otherwise don't compress
+if (supports_zstd(["wsl", "-d", "Ubuntu", "--"])
+        and supports_zstd(["wsl", "-d", "Ubuntu", "--", *SSH_COMMAND.split(), Config.PI_HOST])):
+    compress_flags = ["--compress-choice=zstd", "--compress-level=1"]
+    print("Compression: zstd (level 1)\n")
+else:
+    compress_flags = []
+    print("Compression: off (zstd not available on both ends)\n")
 
-# Sync SQLite database
-print("\nSyncing SQLite database...")
+# Sync ChromaDB and SQLite database in one rsync session.
+# --relative keeps the paths after "/./", so chromadb/ and app.db land
+# directly under PI_PATH; --delete only prunes inside the chromadb tree.
+print("Syncing ChromaDB vector store and SQLite database...")
 try:
     result = subprocess.run(
         [
-            "wsl", "-d", "Ubuntu", "--", "rsync", "-avz",
-            f"{wsl_path}/data/app.db",
+            "wsl", "-d", "Ubuntu", "--", "rsync", "-av", *compress_flags,
+            "--delete", "--relative",
+            "-e", SSH_COMMAND,
+            f"{wsl_path}/data/./chromadb/",
+            f"{wsl_path}/data/./app.db",
             f"{Config.PI_HOST}:{Config.PI_PATH}"
         ],
         capture_output=True,
         text=True,
-        timeout=60
+        timeout=360
     )
     
     if result.returncode == 0:
-        print("✓ Database synced successfully")
+        print("✓ ChromaDB and database synced successfully")
     else:
-        print(f"❌ Database sync failed: {result.stderr}")
+        print(f"❌ Sync failed: {result.stderr}")
         sys.exit(1)
         
 except Exception as e:
-    print(f"❌ Database sync error: {e}")
+    print(f"❌ Sync error: {e}")
     sys.exit(1)
 
 print("\n" + "="*60)
@@ -11,48 +11,43 @@ client = chromadb.PersistentClient(
 collection = client.get_collection(name="documents")
 
 # Test the filter that should be used for "코스트코"
-print("Testing store filter with $contains...")
+print("Testing store filter on normalized store_norm...")
 print("=" * 80)
 
-# This is what the query engine should be doing
-results = collection.get(
-    where={
-        "$and": [
-            {"user_id": 3},
-            {"store": {"$contains": "Costco"}}
-        ]
-    },
-    include=["metadatas"]
-)
-
-print(f"Found {len(results['ids'])} documents matching 'Costco'\n")
-
-for i, doc_id in enumerate(results['ids']):
-    metadata = results['metadatas'][i]
-    print(f"{i+1}. {metadata.get('filename')}")
-    print(f"   Store: {metadata.get('store')}")
-    print(f"   Date: {metadata.get('date')}")
-    print(f"   Total: {metadata.get('total')}")
-    print()
-
-print("=" * 80)
-print("\nNow testing with Korean '코스트코'...")
-results2 = collection.get(
-    where={
-        "$and": [
-            {"user_id": 3},
-            {"store": {"$contains": "코스트코"}}
-        ]
-    },
-    include=["metadatas"]
-)
-
-print(f"Found {len(results2['ids'])} documents matching '코스트코'\n")
-
-for i, doc_id in enumerate(results2['ids']):
-    metadata = results2['metadatas'][i]
-    print(f"{i+1}. {metadata.get('filename')}")
-    print(f"   Store: {metadata.get('store')}")
-    print(f"   Date: {metadata.get('date')}")
-    print(f"   Total: {metadata.get('total')}")
-    print()
+# Number of metadata rows fetched per collection.get call
+PAGE_SIZE = 500
+
+
+def pages(where, page_size=PAGE_SIZE):
+    """Yield collection.get results one page at a time instead of all at once."""
+    offset = 0
+    while True:
+        page = collection.get(where=where, limit=page_size, offset=offset, include=["metadatas"])
+        if not page['ids']:
+            break
+        yield page
+        if len(page['ids']) < page_size:
+            break
+        offset += page_size
+
+
+# This is what the query engine should be doing: "Costco" and "코스트코"
+# both normalize to the same store_norm key, so one exact match covers both
+where = {
+    "$and": [
+        {"user_id": 3},
+        {"store_norm": {"$eq": "costco"}}
+    ]
+}
+
+count = 0
+for page in pages(where):
+    for metadata in page['metadatas']:
+        count += 1
+        print(f"{count}. {metadata.get('filename')}")
+        print(f"   Store: {metadata.get('store')}")
+        print(f"   Date: {metadata.get('date')}")
+        print(f"   Total: {metadata.get('total')}")
+        print()
+
+print(f"Found {count} documents matching 'Costco' / '코스트코'")
@@ -0,0 +1,73 @@
+"""
+Shared fixtures for tests that run against the FastAPI app.
+"""
+
+import os
+import shutil
+import tempfile
+import pytest
+from pathlib import Path
+from fastapi.testclient import TestClient
+
+from backend.config import Config
+
+
+# RAM-backed filesystem for test databases (Linux); falls back to pytest's tmp dir
+SHM_DIR = Path("/dev/shm")
+
+# Persistent data directory used with --reuse-data
+REUSE_DATA_DIR = Path.home() / ".cache" / "docubot-tests"
+
+
+def pytest_addoption(parser):
+    parser.addoption(
+        "--reuse-data",
+        action="store_true",
+        help=f"Keep the test database and vector store in {REUSE_DATA_DIR} between runs"
+    )
+
+
+@pytest.fixture(scope="session")
+def test_data_dir(request, tmp_path_factory):
+    """
+    Create temporary data directory for tests.
+    
+    SQLite and ChromaDB stay real files (export and stats endpoints copy and
+    stat them), but live on tmpfs when available so commits never hit disk.
+    With --reuse-data a persistent per-worker directory is used and kept.
+    """
+    reuse = request.config.getoption("--reuse-data")
+    use_shm = not reuse and SHM_DIR.is_dir() and os.access(SHM_DIR, os.W_OK)
+    if reuse:
+        temp_dir = str(REUSE_DATA_DIR / os.environ.get("PYTEST_XDIST_WORKER", "main"))
+        Path(temp_dir).mkdir(parents=True, exist_ok=True)
+    elif use_shm:
+        temp_dir = tempfile.mkdtemp(prefix="docubot-test-", dir=SHM_DIR)
+    else:
+        temp_dir = str(tmp_path_factory.mktemp("data"))
+    
+    # Override config paths
+    Config.DATA_DIR = Path(temp_dir)
+    Config.CHROMADB_PATH = str(Path(temp_dir) / "chromadb")
+    Config.SQLITE_PATH = str(Path(temp_dir) / "test.db")
+    Config.ensure_data_directories()
+    
+    yield temp_dir
+    
+    # pytest only prunes its own tmp dirs; tmpfs holds RAM until removed
+    if use_shm:
+        shutil.rmtree(temp_dir, ignore_errors=True)
+
+
+@pytest.fixture(scope="session")
+def client(test_data_dir):
+    """
+    Create test client.
+    
+    Session scoped so the app's startup (database, vector store and model
+    setup) runs once for every module that uses it.
+    """
+    from backend.api import app
+    
+    with TestClient(app) as test_client:
+        yield test_client
@@ -4,50 +4,132 @@ Integration tests for REST API endpoints.
 Tests all API endpoints with success and error cases.
 """
 
+import uuid
 import pytest
-import tempfile
-import shutil
 from pathlib import Path
-from fastapi.testclient import TestClient
 
-# Import after setting up test environment
-import sys
-sys.path.insert(0, str(Path(__file__).parent.parent))
+# Fields each endpoint response must contain
+HEALTH_KEYS = frozenset({
+    "status",
+    "memory_usage_percent",
+    "memory_available_mb",
+    "model_loaded",
+    "vector_store_loaded",
+    "total_chunks",
+    "ollama_available",
+    "model_available",
+    "database_available",
+    "errors",
+    "warnings"
+})
+FOLDER_KEYS = frozenset({
+    "id",
+    "path",
+    "added_at"
+})
+PROCESSING_STATUS_KEYS = frozenset({
+    "is_processing",
+    "processed",
+    "skipped",
+    "failed",
+    "failed_files"
+})
+PROCESSING_REPORT_KEYS = frozenset({
+    "total_documents",
+    "total_chunks",
+    "total_embeddings",
+    "failed_documents",
+    "missing_embeddings",
+    "incomplete_metadata",
+    "validation_passed"
+})
+EXPORT_KEYS = frozenset({
+    "package_path",
+    "archive_path",
+    "size_bytes",
+    "size_mb",
+    "statistics",
+    "errors"
+})
+PACKAGE_VALIDATION_KEYS = frozenset({
+    "valid",
+    "errors",
+    "warnings"
+})
+PI_HEALTH_KEYS = frozenset({
+    "status",
+    "memory_usage_percent",
+    "memory_available_mb",
+    "model_loaded",
+    "vector_store_loaded",
+    "total_chunks"
+})
+DATA_STATS_KEYS = frozenset({
+    "total_chunks",
+    "embedding_dimension",
+    "last_update",
+    "vector_store_size_mb",
+    "database_size_mb"
+})
 
-from backend.api import app
-from backend.config import Config
 
+@pytest.fixture(scope="session")
+def folders_root(tmp_path_factory):
+    """Create one base directory for all test folders (resolved, as the API stores paths)."""
+    return tmp_path_factory.mktemp("folders").resolve()
 
-@pytest.fixture(scope="module")
-def test_data_dir():
-    """Create temporary data directory for tests."""
-    temp_dir = tempfile.mkdtemp()
-    
-    # Override config paths
-    Config.DATA_DIR = Path(temp_dir)
-    Config.CHROMADB_PATH = str(Path(temp_dir) / "chromadb")
-    Config.SQLITE_PATH = str(Path(temp_dir) / "test.db")
-    Config.ensure_data_directories()
+
+@pytest.fixture
+def temp_folder(folders_root):
+    """Create a unique temporary folder for testing."""
+    folder = folders_root / uuid.uuid4().hex
+    folder.mkdir()
+    return str(folder)
+
+
+@pytest.fixture(autouse=True)
+def clear_folders(client):
+    """Start each test with no watched folders, since the app is shared across the session."""
+    from backend import api
     
-    yield temp_dir
+    with api.db_manager.transaction() as conn:
+        conn.execute("DELETE FROM folders")
+
+
+@pytest.fixture
+def make_conversation(client):
+    """Return a factory that creates a conversation and returns its ID."""
+    def _make(title="Test Conversation"):
+        response = client.post(
+            "/api/conversations/create",
+            json={"title": title}
+        )
+        assert response.status_code == 200
+        return response.json()["conversation"]["id"]
     
-    # Cleanup
-    shutil.rmtree(temp_dir, ignore_errors=True)
+    return _make
+
+
+@pytest.fixture
+def conversation_id(make_conversation):
+    """Create a conversation and return its ID."""
+    return make_conversation()
 
 
-@pytest.fixture(scope="module")
-def client(test_data_dir):
-    """Create test client."""
-    with TestClient(app) as test_client:
-        yield test_client
+class StubQueryEngine:
+    """Query engine stand-in that answers instantly without Ollama."""
+    
+    def query(self, question, user_id, conversation_history=None, top_k=15, timeout_seconds=10):
+        return {"answer": "stub", "sources": []}
 
 
 @pytest.fixture
-def temp_folder():
-    """Create temporary folder for testing."""
-    temp_dir = tempfile.mkdtemp()
-    yield temp_dir
-    shutil.rmtree(temp_dir, ignore_errors=True)
+def query_backend(request, monkeypatch):
+    """Use the stub query engine unless the test is parametrized with "live"."""
+    if request.param == "stub":
+        from backend import api
+        monkeypatch.setattr(api, "query_engine", StubQueryEngine())
+    return request.param
 
 
 class TestRootEndpoint:
@@ -73,17 +155,7 @@ class TestHealthCheck:
         data = response.json()
         
         # Check response structure
-        assert "status" in data
-        assert "memory_usage_percent" in data
-        assert "memory_available_mb" in data
-        assert "model_loaded" in data
-        assert "vector_store_loaded" in data
-        assert "total_chunks" in data
-        assert "ollama_available" in data
-        assert "model_available" in data
-        assert "database_available" in data
-        assert "errors" in data
-        assert "warnings" in data
+        assert HEALTH_KEYS <= data.keys(), HEALTH_KEYS - data.keys()
         
         # Database and vector store should be available in tests
         assert data["database_available"] is True
@@ -103,16 +175,22 @@ class TestFolderEndpoints:
         data = response.json()
         assert data["success"] is True
         assert "folder" in data
-        assert data["folder"]["path"] == str(Path(temp_folder).resolve())
-    
-    def test_add_folder_invalid_path(self, client):
-        """Test adding an invalid folder path."""
-        response = client.post(
-            "/api/folders/add",
+        assert data["folder"]["path"] == temp_folder
+    
+    @pytest.mark.parametrize("method,url,status,detail", [
+        ("POST", "/api/folders/add", 400, "does not exist"),
+        ("DELETE", "/api/folders/remove", 404, None),
+    ], ids=["add", "remove"])
+    def test_folder_not_found(self, client, method, url, status, detail):
+        """Test adding or removing a folder path that doesn't exist."""
+        response = client.request(
+            method,
+            url,
             json={"path": "/nonexistent/folder/path"}
         )
-        assert response.status_code == 400
-        assert "does not exist" in response.json()["detail"].lower()
+        assert response.status_code == status
+        if detail:
+            assert detail in response.json()["detail"].lower()
     
     def test_add_folder_duplicate(self, client, temp_folder):
         """Test adding the same folder twice."""
@@ -141,9 +219,7 @@ class TestFolderEndpoints:
         
         # Check folder structure
         folder = data["folders"][0]
-        assert "id" in folder
-        assert "path" in folder
-        assert "added_at" in folder
+        assert FOLDER_KEYS <= folder.keys(), FOLDER_KEYS - folder.keys()
     
     def test_remove_folder_success(self, client, temp_folder):
         """Test removing a folder."""
@@ -159,15 +235,6 @@ class TestFolderEndpoints:
         assert response.status_code == 200
         data = response.json()
         assert data["success"] is True
-    
-    def test_remove_folder_not_found(self, client):
-        """Test removing a non-existent folder."""
-        response = client.request(
-            "DELETE",
-            "/api/folders/remove",
-            json={"path": "/nonexistent/folder"}
-        )
-        assert response.status_code == 404
 
 
 class TestProcessingEndpoints:
@@ -180,12 +247,9 @@ class TestProcessingEndpoints:
         data = response.json()
         
         # Check response structure
-        assert "is_processing" in data
-        assert "processed" in data
-        assert "skipped" in data
-        assert "failed" in data
-        assert "failed_files" in data
+        assert PROCESSING_STATUS_KEYS <= data.keys(), PROCESSING_STATUS_KEYS - data.keys()
     
+    @pytest.mark.slow
     def test_start_processing(self, client):
         """Test starting document processing."""
         response = client.post("/api/process/start")
@@ -198,11 +262,15 @@ class TestProcessingEndpoints:
 class TestConversationEndpoints:
     """Tests for conversation management endpoints."""
     
-    def test_create_conversation(self, client):
-        """Test creating a conversation."""
+    @pytest.mark.parametrize("payload", [
+        {"title": "Test Conversation"},
+        {},
+    ], ids=["with_title", "no_title"])
+    def test_create_conversation(self, client, payload):
+        """Test creating a conversation with and without a title."""
         response = client.post(
             "/api/conversations/create",
-            json={"title": "Test Conversation"}
+            json=payload
         )
         assert response.status_code == 200
         data = response.json()
@@ -211,28 +279,16 @@ class TestConversationEndpoints:
         
         conversation = data["conversation"]
         assert "id" in conversation
-        assert conversation["title"] == "Test Conversation"
+        if "title" in payload:
+            assert conversation["title"] == payload["title"]
         assert "created_at" in conversation
         assert "updated_at" in conversation
         assert conversation["messages"] == []
     
-    def test_create_conversation_no_title(self, client):
-        """Test creating a conversation without a title."""
-        response = client.post(
-            "/api/conversations/create",
-            json={}
-        )
-        assert response.status_code == 200
-        data = response.json()
-        assert data["success"] is True
-    
-    def test_list_conversations(self, client):
+    def test_list_conversations(self, client, make_conversation):
         """Test listing conversations."""
         # Create a conversation
-        create_response = client.post(
-            "/api/conversations/create",
-            json={"title": "Test List"}
-        )
+        make_conversation("Test List")
         
         # List conversations
         response = client.get("/api/conversations/list")
@@ -241,15 +297,8 @@ class TestConversationEndpoints:
         assert "conversations" in data
         assert len(data["conversations"]) > 0
     
-    def test_get_conversation(self, client):
+    def test_get_conversation(self, client, conversation_id):
         """Test getting a conversation."""
-        # Create a conversation
-        create_response = client.post(
-            "/api/conversations/create",
-            json={"title": "Test Get"}
-        )
-        conversation_id = create_response.json()["conversation"]["id"]
-        
         # Get conversation
         response = client.get(f"/api/conversations/{conversation_id}")
         assert response.status_code == 200
@@ -260,20 +309,14 @@ class TestConversationEndpoints:
         assert conversation["id"] == conversation_id
         assert "messages" in conversation
     
-    def test_get_conversation_not_found(self, client):
-        """Test getting a non-existent conversation."""
-        response = client.get("/api/conversations/invalid-id")
+    @pytest.mark.parametrize("method", ["GET", "DELETE"])
+    def test_conversation_not_found(self, client, method):
+        """Test getting or deleting a non-existent conversation."""
+        response = client.request(method, "/api/conversations/invalid-id")
         assert response.status_code == 404
     
-    def test_delete_conversation(self, client):
+    def test_delete_conversation(self, client, conversation_id):
         """Test deleting a conversation."""
-        # Create a conversation
-        create_response = client.post(
-            "/api/conversations/create",
-            json={"title": "Test Delete"}
-        )
-        conversation_id = create_response.json()["conversation"]["id"]
-        
         # Delete conversation
         response = client.delete(f"/api/conversations/{conversation_id}")
         assert response.status_code == 200
@@ -283,11 +326,6 @@ class TestConversationEndpoints:
         # Verify it's deleted
         get_response = client.get(f"/api/conversations/{conversation_id}")
         assert get_response.status_code == 404
-    
-    def test_delete_conversation_not_found(self, client):
-        """Test deleting a non-existent conversation."""
-        response = client.delete("/api/conversations/invalid-id")
-        assert response.status_code == 404
 
 
 class TestQueryEndpoint:
@@ -304,15 +342,13 @@ class TestQueryEndpoint:
         )
         assert response.status_code == 404
     
-    def test_query_success(self, client):
-        """Test successful query."""
-        # Create a conversation
-        create_response = client.post(
-            "/api/conversations/create",
-            json={"title": "Test Query"}
-        )
-        conversation_id = create_response.json()["conversation"]["id"]
-        
+    @pytest.mark.parametrize(
+        "query_backend",
+        ["stub", pytest.param("live", marks=pytest.mark.slow)],
+        indirect=True
+    )
+    def test_query_success(self, client, conversation_id, query_backend):
+        """Test successful query (the live case calls the real LLM)."""
         # Submit query
         response = client.post(
             "/api/query",
@@ -344,13 +380,7 @@ class TestExportEndpoints:
         assert response.status_code == 200
         
         data = response.json()
-        assert "total_documents" in data
-        assert "total_chunks" in data
-        assert "total_embeddings" in data
-        assert "failed_documents" in data
-        assert "missing_embeddings" in data
-        assert "incomplete_metadata" in data
-        assert "validation_passed" in data
+        assert PROCESSING_REPORT_KEYS <= data.keys(), PROCESSING_REPORT_KEYS - data.keys()
         
         # Check types
         assert isinstance(data["total_documents"], int)
@@ -361,6 +391,7 @@ class TestExportEndpoints:
         assert isinstance(data["incomplete_metadata"], list)
         assert isinstance(data["validation_passed"], bool)
     
+    @pytest.mark.slow
     def test_create_export_full(self, client, test_data_dir):
         """Test creating full export package."""
         # Note: This test expects ChromaDB directory to exist
@@ -386,13 +417,9 @@ class TestExportEndpoints:
             assert response.status_code == 200
             data = response.json()
             assert data["success"] is True
-            assert "package_path" in data
-            assert "archive_path" in data
-            assert "size_bytes" in data
-            assert "size_mb" in data
-            assert "statistics" in data
-            assert "errors" in data
+            assert EXPORT_KEYS <= data.keys(), EXPORT_KEYS - data.keys()
     
+    @pytest.mark.slow
     def test_create_export_incremental(self, client, test_data_dir):
         """Test creating incremental export package."""
         from datetime import datetime, timedelta
@@ -448,9 +475,7 @@ class TestExportEndpoints:
         assert response.status_code == 200
         
         data = response.json()
-        assert "valid" in data
-        assert "errors" in data
-        assert "warnings" in data
+        assert PACKAGE_VALIDATION_KEYS <= data.keys(), PACKAGE_VALIDATION_KEYS - data.keys()
         assert isinstance(data["valid"], bool)
         assert isinstance(data["errors"], list)
         assert isinstance(data["warnings"], list)
@@ -483,12 +508,7 @@ class TestPiSpecificEndpoints:
         data = response.json()
         
         # Check Pi-specific fields are present
-        assert "status" in data
-        assert "memory_usage_percent" in data
-        assert "memory_available_mb" in data
-        assert "model_loaded" in data
-        assert "vector_store_loaded" in data
-        assert "total_chunks" in data
+        assert PI_HEALTH_KEYS <= data.keys(), PI_HEALTH_KEYS - data.keys()
         
         # Check types
         assert isinstance(data["memory_usage_percent"], (int, float))
@@ -507,11 +527,7 @@ class TestPiSpecificEndpoints:
         assert response.status_code == 200
         
         data = response.json()
-        assert "total_chunks" in data
-        assert "embedding_dimension" in data
-        assert "last_update" in data
-        assert "vector_store_size_mb" in data
-        assert "database_size_mb" in data
+        assert DATA_STATS_KEYS <= data.keys(), DATA_STATS_KEYS - data.keys()
         
         # Check types
         assert isinstance(data["total_chunks"], int)
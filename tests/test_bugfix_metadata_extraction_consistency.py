@@ -11,6 +11,8 @@ This test encodes the expected behavior and will validate the fix when it passes
 """
 
 import pytest
+import inspect
+import re
 from datetime import datetime
 from typing import List, Dict, Any
 import tempfile
@@ -25,6 +27,24 @@ from backend.image_processor import ImageProcessor
 from backend.llm_generator import LLMGenerator
 
 
+# Source/signature inspection of the code under test, done once at import
+QUERY_SIGNATURE = inspect.signature(QueryEngine.query)
+PROCESS_IMAGE_SOURCE = inspect.getsource(ImageProcessor.process_image)
+GENERATE_RESPONSE_SOURCE = inspect.getsource(LLMGenerator.generate_general_response)
+NUM_PREDICT_PATTERN = re.compile(r'"num_predict":\s*(\d+)')
+
+
+# Built once per class: QueryEngine loads the embedding model on construction
+@pytest.fixture(scope="class")
+def image_processor():
+    return ImageProcessor()
+
+
+@pytest.fixture(scope="class")
+def query_engine():
+    return QueryEngine()
+
+
 class TestMetadataExtractionConsistencyBugCondition:
     """
     Bug Condition Exploration Test for Metadata Extraction Consistency Bugs
@@ -43,7 +63,7 @@ class TestMetadataExtractionConsistencyBugCondition:
     EXPECTED OUTCOME ON FIXED CODE: Test PASSES - all bugs are fixed
     """
     
-    def test_field_name_inconsistency(self):
+    def test_field_name_inconsistency(self, image_processor):
         """
         Test 1.1: Field Name Inconsistency
         
@@ -79,11 +99,10 @@ class TestMetadataExtractionConsistencyBugCondition:
         
         print(f"\nSimulating 3 identical Costco receipts with different field names:")
         
-        processor = ImageProcessor()
         field_names_used = []
         
         for i, response in enumerate(vision_responses):
-            extraction = processor._parse_response(response)
+            extraction = image_processor._parse_response(response)
             metadata = extraction.flexible_metadata
             
             # Check which field name was used for the store
@@ -118,7 +137,7 @@ class TestMetadataExtractionConsistencyBugCondition:
                 f"instead of canonical 'store'. This is expected on unfixed code."
             )
     
-    def test_type_inconsistency(self):
+    def test_type_inconsistency(self, image_processor):
         """
         Test 1.2: Type Inconsistency
         
@@ -150,8 +169,7 @@ class TestMetadataExtractionConsistencyBugCondition:
         print(f"\nSimulating receipt with numeric fields:")
         print(f"  Vision response: {vision_response}")
         
-        processor = ImageProcessor()
-        extraction = processor._parse_response(vision_response)
+        extraction = image_processor._parse_response(vision_response)
         metadata = extraction.flexible_metadata
         
         # Check types of numeric fields
@@ -184,7 +202,7 @@ class TestMetadataExtractionConsistencyBugCondition:
                 f"are stored as strings instead of numeric types. This is expected on unfixed code."
             )
     
-    def test_filter_extraction_failure(self):
+    def test_filter_extraction_failure(self, query_engine):
         """
         Test 1.3: Filter Extraction Failure
         
@@ -209,8 +227,6 @@ class TestMetadataExtractionConsistencyBugCondition:
         print(f"BUG 3 ANALYSIS: Filter Extraction Failure")
         print(f"{'='*70}")
         
-        query_engine = QueryEngine()
-        
         # Test queries with store-specific intent
         test_queries = [
             "How much did I spend at Costco?",
@@ -306,12 +322,8 @@ class TestMetadataExtractionConsistencyBugCondition:
             # Query for total spending (aggregation query)
             print(f"\nQuerying: 'What's my total spending?'")
             
-            query_engine = QueryEngine()
-            
             # Check the default top_k parameter in query method
-            import inspect
-            query_signature = inspect.signature(QueryEngine.query)
-            default_top_k = query_signature.parameters['top_k'].default
+            default_top_k = QUERY_SIGNATURE.parameters['top_k'].default
             
             print(f"  Default top_k parameter: {default_top_k}")
             
@@ -340,7 +352,7 @@ class TestMetadataExtractionConsistencyBugCondition:
             except (PermissionError, OSError):
                 pass
     
-    def test_response_instability(self):
+    def test_response_instability(self, image_processor):
         """
         Test 1.5: Response Instability
         
@@ -369,15 +381,8 @@ class TestMetadataExtractionConsistencyBugCondition:
         print(f"BUG 5 ANALYSIS: Response Instability")
         print(f"{'='*70}")
         
-        processor = ImageProcessor()
-        
         # Check num_predict setting in process_image
-        import inspect
-        process_image_source = inspect.getsource(processor.process_image)
-        
-        # Extract num_predict value
-        import re
-        num_predict_match = re.search(r'"num_predict":\s*(\d+)', process_image_source)
+        num_predict_match = NUM_PREDICT_PATTERN.search(PROCESS_IMAGE_SOURCE)
         num_predict = int(num_predict_match.group(1)) if num_predict_match else None
         
         print(f"\nChecking vision model configuration:")
@@ -392,7 +397,7 @@ class TestMetadataExtractionConsistencyBugCondition:
         print(f"  Contains repetition: Yes")
         
         # Test _fix_repetition_loop
-        fixed_response = processor._fix_repetition_loop(repetitive_response)
+        fixed_response = image_processor._fix_repetition_loop(repetitive_response)
         
         print(f"\nAfter _fix_repetition_loop:")
         print(f"  Fixed length: {len(fixed_response)} chars")
@@ -453,13 +458,7 @@ class TestMetadataExtractionConsistencyBugCondition:
         print(f"{'='*70}")
         
         # Check the generate_general_response method
-        import inspect
-        from backend.llm_generator import LLMGenerator
-        
-        llm_gen = LLMGenerator()
-        
-        # Get source code of generate_general_response
-        gen_response_source = inspect.getsource(llm_gen.generate_general_response)
+        gen_response_source = GENERATE_RESPONSE_SOURCE
         
         print(f"\nAnalyzing generate_general_response method:")
         
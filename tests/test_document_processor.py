@@ -380,3 +380,107 @@ def test_processing_result_dataclass():
     assert result.failed == 1
     assert len(result.failed_files) == 1
     assert result.failed_files[0] == ("file.txt", "error message")
+
+
+def _bare_processor(extraction):
+    """Create a document processor whose image processor returns the given extraction."""
+    image_processor = Mock(spec=ImageProcessor)
+    image_processor.process_image.return_value = extraction
+    return DocumentProcessor(
+        db_manager=Mock(spec=DatabaseManager),
+        folder_manager=Mock(spec=FolderManager),
+        state_manager=Mock(spec=ProcessingStateManager),
+        embedding_engine=Mock(spec=EmbeddingEngine),
+        vector_store=Mock(spec=VectorStore),
+        image_processor=image_processor
+    )
+
+
+def test_extract_image_chunk_without_embedding():
+    """Test extracting an image chunk without embedding or storing it."""
+    extraction = ImageExtraction(
+        raw_text="Costco receipt",
+        flexible_metadata={"store": "Costco", "total": 42.5}
+    )
+    processor = _bare_processor(extraction)
+    
+    chunk = processor.extract_image_chunk("/photos/receipt.jpg", user_id=3)
+    
+    assert chunk is not None
+    assert chunk.embedding is None
+    assert chunk.content == extraction.format_as_text()
+    assert chunk.metadata["user_id"] == 3
+    assert chunk.metadata["filename"] == "receipt.jpg"
+    assert chunk.metadata["file_type"] == "image"
+    assert chunk.metadata["store"] == "Costco"
+    assert not processor.embedding_engine.generate_embedding.called
+    assert not processor.vector_store.add_chunks.called
+
+
+def test_extract_image_chunk_requires_metadata():
+    """Test that extraction without flexible metadata is rejected."""
+    processor = _bare_processor(ImageExtraction(raw_text="blurry photo"))
+    
+    with pytest.raises(ValueError):
+        processor.extract_image_chunk("/photos/blurry.jpg", user_id=1)
+
+
+def test_pdf_as_image_embeds_pages_in_one_batch():
+    """Test that all pages of an image PDF are embedded with one batch call."""
+    from PIL import Image
+    
+    extraction = ImageExtraction(
+        raw_text="Invoice page",
+        flexible_metadata={"vendor": "Acme"}
+    )
+    processor = _bare_processor(extraction)
+    processor.embedding_engine.generate_embeddings_batch.side_effect = (
+        lambda texts: [[0.1] * 384 for _ in texts]
+    )
+    pages = [Image.new("RGB", (10, 10)) for _ in range(3)]
+    
+    with patch("pdf2image.convert_from_path", return_value=pages):
+        result = processor._process_pdf_as_image("/docs/invoice.pdf", folder_id=1, user_id=2)
+    
+    assert result == "processed"
+    processor.embedding_engine.generate_embeddings_batch.assert_called_once()
+    assert not processor.embedding_engine.generate_embedding.called
+    
+    stored = processor.vector_store.add_chunks.call_args.args[0]
+    assert [c.metadata["page_number"] for c in stored] == [1, 2, 3]
+    assert all(c.embedding == [0.1] * 384 for c in stored)
+
+
+def test_pdf_as_image_without_pages_skips_embedding():
+    """Test that a PDF with no extractable pages is skipped before batching."""
+    processor = _bare_processor(ImageExtraction(raw_text=""))
+    
+    with patch("pdf2image.convert_from_path", return_value=[]):
+        result = processor._process_pdf_as_image("/docs/empty.pdf", folder_id=1, user_id=2)
+    
+    assert result == "skipped"
+    assert not processor.embedding_engine.generate_embeddings_batch.called
+    assert not processor.vector_store.add_chunks.called
+
+
+def test_process_image_files_in_parallel_keeps_order():
+    """Test that concurrent image processing returns results in input order."""
+    import threading
+    import time
+    
+    processor = _bare_processor(ImageExtraction(raw_text=""))
+    threads = set()
+    
+    def fake_process(file_path, folder_id, user_id):
+        threads.add(threading.get_ident())
+        # Finish later files first to make ordering mistakes visible
+        time.sleep(0.05 * (3 - int(file_path[-5])))
+        return f"failed:{file_path}" if file_path.endswith("2.jpg") else "processed"
+    
+    image_files = ["/photos/0.jpg", "/photos/1.jpg", "/photos/2.jpg"]
+    with patch.object(processor, "_process_image_file", side_effect=fake_process), \
+            patch("backend.document_processor.Config.IMAGE_PROCESSING_WORKERS", 3):
+        results = processor._process_image_files(image_files, folder_id=1, user_id=2)
+    
+    assert results == ["processed", "processed", "failed:/photos/2.jpg"]
+    assert len(threads) > 1
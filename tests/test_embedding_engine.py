@@ -3,7 +3,9 @@ Unit tests for the embedding engine.
 """
 
 import pytest
-from backend.embedding_engine import EmbeddingEngine, get_embedding_engine
+from unittest.mock import Mock, patch
+
+from backend.embedding_engine import EmbeddingEngine, get_embedding_engine, MAX_EMBEDDING_CHARS
 
 
 class TestEmbeddingEngine:
@@ -144,3 +146,141 @@ class TestEmbeddingEngine:
         
         # Embeddings should be different
         assert embedding1 != embedding2
+
+
+class TestOllamaBatchEmbedding:
+    """Test cases for batched Ollama /api/embed requests."""
+    
+    @pytest.fixture
+    def ollama_engine(self):
+        """Create an engine that believes Ollama is serving bge-m3."""
+        with patch.object(EmbeddingEngine, '_check_ollama_available', return_value=True):
+            engine = EmbeddingEngine(model_name="bge-m3", batch_size=2)
+        assert engine.use_ollama
+        return engine
+    
+    @staticmethod
+    def _embed_response(payload):
+        """Build a fake /api/embed response with one vector per input."""
+        inputs = payload["input"]
+        inputs = inputs if isinstance(inputs, list) else [inputs]
+        response = Mock()
+        response.json.return_value = {"embeddings": [[float(len(t))] * 3 for t in inputs]}
+        return response
+    
+    def test_batch_sends_list_input_per_request(self, ollama_engine):
+        """Texts are sent batch_size at a time instead of one request per text."""
+        texts = ["a", "bb", "ccc", "dddd", "eeeee"]
+        
+        with patch('backend.embedding_engine.requests.post') as mock_post:
+            mock_post.side_effect = lambda url, json, timeout: self._embed_response(json)
+            embeddings = ollama_engine.generate_embeddings_batch(texts)
+        
+        assert mock_post.call_count == 3
+        assert [c.kwargs["json"]["input"] for c in mock_post.call_args_list] == [
+            ["a", "bb"], ["ccc", "dddd"], ["eeeee"]
+        ]
+        assert embeddings == [[float(len(t))] * 3 for t in texts]
+    
+    def test_batch_keeps_zero_vectors_for_empty_texts(self, ollama_engine):
+        """Empty texts are not sent to Ollama and map to zero vectors."""
+        with patch('backend.embedding_engine.requests.post') as mock_post:
+            mock_post.side_effect = lambda url, json, timeout: self._embed_response(json)
+            embeddings = ollama_engine.generate_embeddings_batch(["a", "", "ccc"])
+        
+        assert mock_post.call_count == 1
+        assert mock_post.call_args.kwargs["json"]["input"] == ["a", "ccc"]
+        assert embeddings[0] == [1.0] * 3
+        assert embeddings[1] == [0.0] * 1024
+        assert embeddings[2] == [3.0] * 3
+    
+    def test_batch_falls_back_to_sequential_on_incomplete_response(self, ollama_engine):
+        """A response without one embedding per input triggers per-text requests."""
+        def fake_post(url, json, timeout):
+            if isinstance(json["input"], list):
+                response = Mock()
+                response.json.return_value = {}
+                return response
+            return self._embed_response(json)
+        
+        with patch('backend.embedding_engine.requests.post', side_effect=fake_post) as mock_post:
+            embeddings = ollama_engine.generate_embeddings_batch(["a", "bb"])
+        
+        # One batched request, then one request per text
+        assert mock_post.call_count == 3
+        assert embeddings == [[1.0] * 3, [2.0] * 3]
+    
+    def test_repeated_texts_are_served_from_cache(self, ollama_engine):
+        """Texts seen before, or repeated within a batch, are embedded once."""
+        with patch('backend.embedding_engine.requests.post') as mock_post:
+            mock_post.side_effect = lambda url, json, timeout: self._embed_response(json)
+            first = ollama_engine.generate_embeddings_batch(["a", "bb", "a"])
+            second = ollama_engine.generate_embeddings_batch(["bb", "ccc"])
+        
+        assert [c.kwargs["json"]["input"] for c in mock_post.call_args_list] == [
+            ["a", "bb"], ["ccc"]
+        ]
+        assert first == [[1.0] * 3, [2.0] * 3, [1.0] * 3]
+        assert second == [[2.0] * 3, [3.0] * 3]
+        
+        info = ollama_engine.get_cache_info()
+        assert info["hits"] == 1
+        assert info["misses"] == 4
+        assert info["size"] == 3
+    
+    def test_single_embedding_uses_cache(self, ollama_engine):
+        """generate_embedding reuses vectors cached by earlier calls."""
+        with patch('backend.embedding_engine.requests.post') as mock_post:
+            mock_post.side_effect = lambda url, json, timeout: self._embed_response(json)
+            ollama_engine.generate_embeddings_batch(["hello"])
+            embedding = ollama_engine.generate_embedding("hello")
+        
+        assert mock_post.call_count == 1
+        assert embedding == [5.0] * 3
+    
+    def test_long_text_truncated_the_same_in_single_and_batch(self, ollama_engine):
+        """Single and batch calls send the same truncated text and share its cache entry."""
+        long_text = "x" * (MAX_EMBEDDING_CHARS + 500)
+        
+        with patch('backend.embedding_engine.requests.post') as mock_post:
+            mock_post.side_effect = lambda url, json, timeout: self._embed_response(json)
+            single = ollama_engine.generate_embedding(long_text)
+            batch = ollama_engine.generate_embeddings_batch([long_text + "tail"])
+        
+        assert mock_post.call_count == 1
+        assert mock_post.call_args.kwargs["json"]["input"] == "x" * MAX_EMBEDDING_CHARS
+        assert single == batch[0] == [float(MAX_EMBEDDING_CHARS)] * 3
+    
+    def test_disk_cache_persists_across_engines(self, tmp_path):
+        """Embeddings written by one engine are reused by the next one."""
+        cache_path = str(tmp_path / "embedding_cache.db")
+        with patch.object(EmbeddingEngine, '_check_ollama_available', return_value=True):
+            first = EmbeddingEngine(model_name="bge-m3", batch_size=2, cache_path=cache_path)
+            second = EmbeddingEngine(model_name="bge-m3", batch_size=2, cache_path=cache_path)
+            other_model = EmbeddingEngine(model_name="mxbai-embed-large", batch_size=2, cache_path=cache_path)
+        
+        with patch('backend.embedding_engine.requests.post') as mock_post:
+            mock_post.side_effect = lambda url, json, timeout: self._embed_response(json)
+            first.generate_embeddings_batch(["a", "bb"])
+            assert mock_post.call_count == 1
+            
+            assert second.generate_embeddings_batch(["a", "bb"]) == [[1.0] * 3, [2.0] * 3]
+            assert mock_post.call_count == 1
+            
+            # A different model never sees another model's vectors
+            other_model.generate_embedding("a")
+            assert mock_post.call_count == 2
+    
+    def test_singleton_only_reloads_for_a_different_model(self):
+        """get_embedding_engine reuses the instance unless another model is requested."""
+        with patch('backend.embedding_engine._embedding_engine_instance', None), \
+                patch.object(EmbeddingEngine, '_check_ollama_available', return_value=True):
+            engine = get_embedding_engine(model_name="bge-m3")
+            
+            assert get_embedding_engine() is engine
+            assert get_embedding_engine(model_name="bge-m3") is engine
+            
+            replaced = get_embedding_engine(model_name="mxbai-embed-large")
+            assert replaced is not engine
+            assert replaced.model_name == "mxbai-embed-large"
+            assert get_embedding_engine() is replaced
@@ -360,3 +360,45 @@ def test_incremental_export_manifest_includes_base_version(temp_dir, mock_config
     assert manifest['incremental']['since_timestamp'] == since_timestamp.isoformat()
     # base_version is None for now (could be enhanced in future)
     assert manifest['incremental']['base_version'] is None
+
+
+def test_incremental_export_uses_tuned_hnsw_settings(temp_dir, mock_config):
+    """Test that the exported collection is created with the Pi HNSW settings."""
+    mock_collection = MagicMock()
+    mock_collection.get.return_value = {
+        'ids': ['chunk1'],
+        'embeddings': [[0.1] * 384],
+        'documents': ['doc1'],
+        'metadatas': [{'filename': 'new1.txt', 'folder_path': '/data', 'file_type': 'text'}]
+    }
+    mock_collection.name = "documents"
+    
+    mock_vector_store = Mock(spec=VectorStore)
+    mock_vector_store.collection = mock_collection
+    
+    mock_cursor = MagicMock()
+    mock_cursor.fetchall.return_value = [{'file_path': '/data/new1.txt'}]
+    mock_conn = MagicMock()
+    mock_conn.execute.return_value = mock_cursor
+    mock_conn.__enter__ = Mock(return_value=mock_conn)
+    mock_conn.__exit__ = Mock(return_value=False)
+    
+    mock_db_manager = Mock(spec=DatabaseManager)
+    mock_db_manager.transaction.return_value = mock_conn
+    
+    export_manager = ExportManager(mock_config, mock_vector_store, mock_db_manager)
+    
+    with patch('chromadb.PersistentClient') as mock_client_class:
+        mock_client = MagicMock()
+        mock_client_class.return_value = mock_client
+        
+        export_manager._create_incremental_chromadb(
+            Path(temp_dir) / "chromadb_export",
+            datetime(2024, 1, 1)
+        )
+        
+        metadata = mock_client.get_or_create_collection.call_args.kwargs['metadata']
+        assert metadata['hnsw:space'] == 'cosine'
+        assert metadata['hnsw:M'] == 32
+        assert metadata['hnsw:construction_ef'] == 200
+        assert metadata['hnsw:search_ef'] == 64
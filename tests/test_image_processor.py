@@ -80,6 +80,35 @@ class TestImageProcessor:
         with pytest.raises(FileNotFoundError):
             processor.process_image("/nonexistent/image.jpg")
 
+    
+    @patch('backend.image_processor.encode_image_to_base64')
+    def test_process_image_uses_extraction_cache(self, mock_encode, tmp_path):
+        """Test repeated processing of the same image reuses the cached extraction."""
+        mock_encode.return_value = "base64_image_data"
+        
+        image_path = tmp_path / "receipt.bin"
+        image_path.write_bytes(b"same image bytes")
+        
+        mock_client = Mock()
+        mock_client.model = "qwen3-vl:8b"
+        mock_client.generate.return_value = {
+            "response": '{"store": "Costco", "total": "222.18"}',
+            "done": True
+        }
+        
+        processor = ImageProcessor(mock_client, cache_dir=str(tmp_path / "cache"))
+        first = processor.process_image(str(image_path))
+        second = processor.process_image(str(image_path))
+        
+        mock_client.generate.assert_called_once()
+        assert second.raw_text == first.raw_text
+        assert second.flexible_metadata == first.flexible_metadata
+        
+        # Changing the image contents must miss the cache
+        image_path.write_bytes(b"different image bytes")
+        processor.process_image(str(image_path))
+        assert mock_client.generate.call_count == 2
+
 
 class TestResponseParsing:
     """Test vision model response parsing."""
@@ -204,6 +233,36 @@ Line Items:
         assert result.currency is None
         assert len(result.line_items) == 0
         assert result.raw_text == ""
+    
+    def test_parse_response_json_embedded_in_text(self):
+        """Test parsing a JSON object surrounded by prose."""
+        processor = ImageProcessor()
+        raw_text = 'Here is the data: {"store": "Costco", "total": "411.89"} Let me know if you need more.'
+        result = processor._parse_response(raw_text)
+        
+        assert result.flexible_metadata["store"] == "Costco"
+        assert result.flexible_metadata["total"] == 411.89
+    
+    def test_parse_response_truncated_json_ignores_nested_objects(self):
+        """Test that a cut-off receipt doesn't return one of its line items as the metadata."""
+        processor = ImageProcessor()
+        raw_text = (
+            '{"store": "Costco", "total": 411.89, "items": '
+            '[{"name": "Milk", "price": 5.99}, {"name": "Eggs", "pri'
+        )
+        result = processor._parse_response(raw_text)
+        
+        assert "name" not in result.flexible_metadata
+        assert "price" not in result.flexible_metadata
+    
+    def test_parse_response_skips_non_json_braces(self):
+        """Test that a closed non-JSON brace group before the JSON is skipped."""
+        processor = ImageProcessor()
+        raw_text = 'Fields {store, total}: {"store": "Costco", "details": {"lane": 3}}'
+        result = processor._parse_response(raw_text)
+        
+        assert result.flexible_metadata["store"] == "Costco"
+        assert "lane" not in result.flexible_metadata
 
 
 class TestConvenienceFunction:
@@ -52,7 +52,7 @@ class TestOllamaClient:
         client = OllamaClient()
         assert client.timeout == 30
     
-    @patch('requests.get')
+    @patch('requests.Session.get')
     def test_health_check_success(self, mock_get):
         """Test successful health check."""
         mock_response = Mock()
@@ -63,7 +63,7 @@ class TestOllamaClient:
         assert client.health_check() is True
         mock_get.assert_called_once()
     
-    @patch('requests.get')
+    @patch('requests.Session.get')
     def test_health_check_failure(self, mock_get):
         """Test failed health check."""
         mock_get.side_effect = requests.exceptions.ConnectionError()
@@ -71,7 +71,7 @@ class TestOllamaClient:
         client = OllamaClient()
         assert client.health_check() is False
     
-    @patch('requests.get')
+    @patch('requests.Session.get')
     def test_is_model_available_success(self, mock_get):
         """Test model availability check when model exists."""
         mock_response = Mock()
@@ -87,7 +87,7 @@ class TestOllamaClient:
         client = OllamaClient()
         assert client.is_model_available() is True
     
-    @patch('requests.get')
+    @patch('requests.Session.get')
     def test_is_model_available_not_found(self, mock_get):
         """Test model availability check when model doesn't exist."""
         mock_response = Mock()
@@ -102,7 +102,7 @@ class TestOllamaClient:
         client = OllamaClient()
         assert client.is_model_available() is False
     
-    @patch('requests.get')
+    @patch('requests.Session.get')
     def test_is_model_available_connection_error(self, mock_get):
         """Test model availability check with connection error."""
         mock_get.side_effect = requests.exceptions.ConnectionError()
@@ -110,7 +110,7 @@ class TestOllamaClient:
         client = OllamaClient()
         assert client.is_model_available() is False
     
-    @patch('requests.post')
+    @patch('requests.Session.post')
     def test_generate_success(self, mock_post):
         """Test successful generation."""
         mock_response = Mock()
@@ -128,7 +128,7 @@ class TestOllamaClient:
         assert result["done"] is True
         mock_post.assert_called_once()
     
-    @patch('requests.post')
+    @patch('requests.Session.post')
     def test_generate_with_images(self, mock_post):
         """Test generation with images."""
         mock_response = Mock()
@@ -150,7 +150,7 @@ class TestOllamaClient:
         call_args = mock_post.call_args
         assert "images" in call_args[1]["json"]
     
-    @patch('requests.post')
+    @patch('requests.Session.post')
     @patch('time.sleep')
     def test_generate_retry_on_timeout(self, mock_sleep, mock_post):
         """Test retry logic on timeout."""
@@ -168,7 +168,7 @@ class TestOllamaClient:
         assert mock_post.call_count == 3
         assert mock_sleep.call_count == 2  # Sleep between retries
     
-    @patch('requests.post')
+    @patch('requests.Session.post')
     @patch('time.sleep')
     def test_generate_max_retries_exceeded(self, mock_sleep, mock_post):
         """Test that max retries are respected."""
@@ -181,7 +181,7 @@ class TestOllamaClient:
         assert "timed out" in str(exc_info.value).lower()
         assert mock_post.call_count == 3  # Max retries
     
-    @patch('requests.post')
+    @patch('requests.Session.post')
     def test_generate_api_error(self, mock_post):
         """Test handling of API errors."""
         mock_response = Mock()
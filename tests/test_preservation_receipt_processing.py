@@ -17,6 +17,16 @@ from pathlib import Path
 from backend.image_processor import ImageProcessor
 from backend.models import ImageExtraction
 
+# Real receipt images from the testing directory (not checked in; discovered once at collection)
+RECEIPT_IMAGE_CANDIDATES = [
+    "testing/KakaoTalk_20260219_155002406.jpg",
+    "testing/KakaoTalk_20260219_155002406_01.jpg",
+    "testing/KakaoTalk_20260219_155002406_02.jpg",
+    "testing/KakaoTalk_20260219_155140673.jpg",
+    "testing/KakaoTalk_20260219_155151473.jpg",
+]
+RECEIPT_IMAGES = [img for img in RECEIPT_IMAGE_CANDIDATES if os.path.exists(img)]
+
 
 class TestReceiptProcessingPreservation:
     """
@@ -34,6 +44,7 @@ class TestReceiptProcessingPreservation:
     EXPECTED OUTCOME ON FIXED CODE: Test PASSES - same receipt fields extracted (now in flexible_metadata)
     """
     
+    @pytest.mark.skipif(not RECEIPT_IMAGES, reason="No receipt images found for preservation testing")
     def test_receipt_processing_baseline(self):
         """
         Test 2.1: Receipt Processing Preservation Test
@@ -60,20 +71,7 @@ class TestReceiptProcessingPreservation:
         print(f"PRESERVATION TEST: Receipt Processing Baseline")
         print(f"{'='*70}")
         
-        # Use real receipt images from testing directory
-        receipt_images = [
-            "testing/KakaoTalk_20260219_155002406.jpg",
-            "testing/KakaoTalk_20260219_155002406_01.jpg",
-            "testing/KakaoTalk_20260219_155002406_02.jpg",
-            "testing/KakaoTalk_20260219_155140673.jpg",
-            "testing/KakaoTalk_20260219_155151473.jpg",
-        ]
-        
-        # Find available receipt images
-        available_receipts = [img for img in receipt_images if os.path.exists(img)]
-        
-        if len(available_receipts) == 0:
-            pytest.skip("No receipt images found for preservation testing")
+        available_receipts = RECEIPT_IMAGES
         
         print(f"\nProcessing {len(available_receipts)} receipt images to establish baseline...")
         
@@ -9,7 +9,7 @@ import time
 from pathlib import Path
 from datetime import datetime
 
-from backend.processing_state import ProcessingStateManager
+from backend.processing_state import ProcessingStateManager, file_sha256
 from backend.database import DatabaseManager
 
 
@@ -119,6 +119,17 @@ class TestComputeFileHash:
             assert len(hash_value) == 64
         finally:
             os.unlink(temp_path)
+    
+    def test_file_sha256_without_file_digest(self, tmp_path, monkeypatch):
+        """Test the chunked fallback used before Python 3.11 matches hashlib."""
+        import hashlib
+        
+        data = os.urandom((1 << 20) + 123)  # Spans more than one read buffer
+        file_path = tmp_path / "data.bin"
+        file_path.write_bytes(data)
+        
+        monkeypatch.delattr(hashlib, "file_digest", raising=False)
+        assert file_sha256(str(file_path)) == hashlib.sha256(data).hexdigest()
 
 
 class TestCheckFileState:
@@ -317,5 +328,74 @@ class TestIntegration:
                     os.unlink(file_path)
 
 
+class TestUpdateFileStates:
+    """Test batched processing state updates."""
+    
+    @pytest.fixture
+    def user_folder(self, temp_db):
+        """Create a user and a folder owned by that user."""
+        with temp_db.transaction() as conn:
+            user_id = conn.execute(
+                "INSERT INTO users (username) VALUES (?)",
+                ("tester",)
+            ).lastrowid
+            folder_id = conn.execute(
+                "INSERT INTO folders (path, user_id) VALUES (?, ?)",
+                ("/test/folder", user_id)
+            ).lastrowid
+        
+        return folder_id, user_id
+    
+    @pytest.fixture
+    def temp_files(self):
+        """Create several temporary files."""
+        files = []
+        for i in range(3):
+            with tempfile.NamedTemporaryFile(mode='w', delete=False, suffix='.txt') as f:
+                f.write(f"Content {i}")
+                files.append(f.name)
+        
+        yield files
+        
+        for file_path in files:
+            if os.path.exists(file_path):
+                os.unlink(file_path)
+    
+    def test_update_file_states_batch(self, state_manager, temp_db, user_folder, temp_files):
+        """Test that all files in a batch are recorded as unchanged."""
+        folder_id, user_id = user_folder
+        
+        state_manager.update_file_states(
+            [(file_path, folder_id, "text", user_id) for file_path in temp_files]
+        )
+        
+        for file_path in temp_files:
+            assert state_manager.check_file_state(file_path) == "unchanged"
+        
+        with temp_db.transaction() as conn:
+            count = conn.execute("SELECT COUNT(*) FROM processed_files").fetchone()[0]
+        assert count == len(temp_files)
+    
+    def test_update_file_states_empty(self, state_manager):
+        """Test that an empty batch is a no-op."""
+        state_manager.update_file_states([])
+    
+    def test_update_file_states_invalid_folder_writes_nothing(
+        self, state_manager, temp_db, user_folder, temp_files
+    ):
+        """Test that an invalid folder_id rolls back the whole batch."""
+        folder_id, user_id = user_folder
+        
+        with pytest.raises(ValueError):
+            state_manager.update_file_states([
+                (temp_files[0], folder_id, "text", user_id),
+                (temp_files[1], 99999, "text", user_id)
+            ])
+        
+        with temp_db.transaction() as conn:
+            count = conn.execute("SELECT COUNT(*) FROM processed_files").fetchone()[0]
+        assert count == 0
+
+
 if __name__ == "__main__":
     pytest.main([__file__, "-v"])
@@ -12,8 +12,6 @@ the system displays a user-friendly error message (not raw stack traces or techn
 """
 
 import pytest
-import tempfile
-import shutil
 from pathlib import Path
 from hypothesis import given, strategies as st, settings, assume
 from unittest.mock import patch, Mock, MagicMock
@@ -22,42 +20,16 @@ from backend.query_engine import QueryEngine
 from backend.folder_manager import FolderManager
 from backend.database import DatabaseManager
 from backend.config import Config
-from backend.api import app
-from fastapi.testclient import TestClient
 import re
 
 
 # Test fixtures
-@pytest.fixture(scope="module")
-def test_data_dir():
-    """Create temporary data directory for tests."""
-    temp_dir = tempfile.mkdtemp()
-    
-    # Override config paths
-    Config.DATA_DIR = Path(temp_dir)
-    Config.CHROMADB_PATH = str(Path(temp_dir) / "chromadb")
-    Config.SQLITE_PATH = str(Path(temp_dir) / "test.db")
-    Config.ensure_data_directories()
-    
-    yield temp_dir
-    
-    # Cleanup
-    shutil.rmtree(temp_dir, ignore_errors=True)
-
-
 @pytest.fixture(scope="module")
 def db_manager(test_data_dir):
     """Create database manager for tests."""
     return DatabaseManager()
 
 
-@pytest.fixture(scope="module")
-def client(test_data_dir):
-    """Create test client."""
-    with TestClient(app) as test_client:
-        yield test_client
-
-
 # Custom strategies for generating error scenarios
 @st.composite
 def invalid_folder_path_strategy(draw):
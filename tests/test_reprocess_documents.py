@@ -0,0 +1,90 @@
+"""
+Unit tests for the buffered writers in scripts/reprocess_documents.py.
+"""
+
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from scripts.reprocess_documents import BufferedVectorStore, BufferedStateManager
+
+
+class SlowVectorStore:
+    """Vector store stand-in whose writes take long enough to overlap."""
+    
+    def __init__(self):
+        self.stored = []
+    
+    def add_chunks(self, chunks):
+        time.sleep(0.005)
+        self.stored.extend(chunks)
+
+
+class RecordingStateManager:
+    """State manager stand-in that checks each file's chunk was stored first."""
+    
+    def __init__(self, vector_store):
+        self.vector_store = vector_store
+        self.rows = []
+        self.rows_without_chunks = []
+    
+    def build_file_state_row(self, file_path, folder_id, file_type, user_id):
+        if file_path.endswith("missing.jpg"):
+            raise FileNotFoundError(f"File not found: {file_path}")
+        return (file_path, folder_id, user_id, "hash", "mtime", file_type)
+    
+    def write_file_states(self, rows):
+        stored = set(self.vector_store.stored)
+        for row in rows:
+            if row[0] not in stored:
+                self.rows_without_chunks.append(row[0])
+        self.rows.extend(rows)
+
+
+def test_buffered_writers_keep_every_update_under_concurrency():
+    """Chunks and state rows from parallel workers are neither lost nor written early."""
+    store = SlowVectorStore()
+    state = RecordingStateManager(store)
+    buffered_store = BufferedVectorStore(store, batch_size=4)
+    buffered_state = BufferedStateManager(state, buffered_store)
+    
+    file_paths = [f"/images/receipt_{i}.jpg" for i in range(200)]
+    
+    def process(file_path):
+        # Same order as DocumentProcessor: chunks first, then the state row
+        buffered_store.add_chunks([file_path])
+        buffered_state.update_file_state(file_path, 1, "image", 1)
+    
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        list(executor.map(process, file_paths))
+    buffered_state.flush()
+    
+    assert sorted(store.stored) == sorted(file_paths)
+    assert sorted(row[0] for row in state.rows) == sorted(file_paths)
+    assert state.rows_without_chunks == []
+    assert buffered_store.pending == []
+    assert buffered_state.pending == []
+
+
+def test_bad_file_fails_its_own_update_not_the_batch():
+    """A missing file raises when its state is recorded; buffered rows still flush."""
+    store = SlowVectorStore()
+    state = RecordingStateManager(store)
+    buffered_store = BufferedVectorStore(store, batch_size=4)
+    buffered_state = BufferedStateManager(state, buffered_store)
+    
+    for file_path in ["/images/a.jpg", "/images/b.jpg"]:
+        buffered_store.add_chunks([file_path])
+        buffered_state.update_file_state(file_path, 1, "image", 1)
+    
+    buffered_store.add_chunks(["/images/missing.jpg"])
+    with pytest.raises(FileNotFoundError, match="missing.jpg"):
+        buffered_state.update_file_state("/images/missing.jpg", 1, "image", 1)
+    
+    buffered_store.add_chunks(["/images/c.jpg"])
+    buffered_state.update_file_state("/images/c.jpg", 1, "image", 1)
+    buffered_state.flush()
+    
+    assert [row[0] for row in state.rows] == ["/images/a.jpg", "/images/b.jpg", "/images/c.jpg"]
+    assert state.rows_without_chunks == []
@@ -9,12 +9,17 @@ import pytest
 from backend.image_processor import ImageProcessor
 
 
+@pytest.fixture(scope="module")
+def processor():
+    """Share one ImageProcessor; _coerce_numeric_types keeps no state."""
+    return ImageProcessor()
+
+
 class TestTypeCoercion:
     """Test suite for numeric type coercion."""
 
-    def test_coerce_numeric_string_to_float(self):
+    def test_coerce_numeric_string_to_float(self, processor):
         """Test that numeric string values are converted to float."""
-        processor = ImageProcessor()
         fields = {
             'total': '411.89',
             'subtotal': '380.00',
@@ -31,9 +36,8 @@ class TestTypeCoercion:
         assert isinstance(result['tax'], float)
         assert result['tax'] == 31.89
 
-    def test_coerce_numeric_string_to_int(self):
+    def test_coerce_numeric_string_to_int(self, processor):
         """Test that whole number strings are converted to int."""
-        processor = ImageProcessor()
         fields = {
             'quantity': '5.0',
             'total': '100.0'
@@ -46,9 +50,8 @@ class TestTypeCoercion:
         assert isinstance(result['total'], int)
         assert result['total'] == 100
 
-    def test_coerce_with_currency_symbols(self):
+    def test_coerce_with_currency_symbols(self, processor):
         """Test that currency symbols are stripped before conversion."""
-        processor = ImageProcessor()
         fields = {
             'total': '$411.89',
             'price': '$ 25.50'
@@ -61,9 +64,8 @@ class TestTypeCoercion:
         assert isinstance(result['price'], float)
         assert result['price'] == 25.50
 
-    def test_coerce_with_commas(self):
+    def test_coerce_with_commas(self, processor):
         """Test that comma separators are handled correctly."""
-        processor = ImageProcessor()
         fields = {
             'total': '1,234.56',
             'amount': '10,000'
@@ -76,9 +78,8 @@ class TestTypeCoercion:
         assert isinstance(result['amount'], int)
         assert result['amount'] == 10000
 
-    def test_non_numeric_fields_unchanged(self):
+    def test_non_numeric_fields_unchanged(self, processor):
         """Test that non-numeric fields are kept as strings."""
-        processor = ImageProcessor()
         fields = {
             'store': 'Costco',
             'date': '2024-02-08',
@@ -94,9 +95,8 @@ class TestTypeCoercion:
         assert isinstance(result['total'], float)
         assert result['total'] == 411.89
 
-    def test_invalid_numeric_value_kept_as_string(self):
+    def test_invalid_numeric_value_kept_as_string(self, processor):
         """Test that invalid numeric values are kept as strings."""
-        processor = ImageProcessor()
         fields = {
             'total': 'invalid',
             'price': 'N/A'
@@ -109,9 +109,8 @@ class TestTypeCoercion:
         assert isinstance(result['price'], str)
         assert result['price'] == 'N/A'
 
-    def test_mixed_fields(self):
+    def test_mixed_fields(self, processor):
         """Test coercion with a mix of numeric and non-numeric fields."""
-        processor = ImageProcessor()
         fields = {
             'store': 'Walmart',
             'date': '2024-03-15',
@@ -140,18 +139,16 @@ class TestTypeCoercion:
         assert isinstance(result['quantity'], int)
         assert result['quantity'] == 3
 
-    def test_empty_fields(self):
+    def test_empty_fields(self, processor):
         """Test that empty dictionary is handled correctly."""
-        processor = ImageProcessor()
         fields = {}
         
         result = processor._coerce_numeric_types(fields)
         
         assert result == {}
 
-    def test_all_numeric_field_types(self):
+    def test_all_numeric_field_types(self, processor):
         """Test all supported numeric field types."""
-        processor = ImageProcessor()
         fields = {
             'total': '100.00',
             'subtotal': '90.00',
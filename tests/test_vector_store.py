@@ -3,34 +3,27 @@ Unit tests for the vector store.
 """
 
 import pytest
-import os
-import shutil
 from backend.vector_store import VectorStore, get_vector_store
 from backend.models import DocumentChunk, QueryResult
 
 
 @pytest.fixture
 def temp_vector_store(tmp_path):
-    """Create a temporary vector store for testing."""
+    """
+    Create a temporary vector store for testing.
+    
+    The directory lives under tmp_path, so pytest's tmp retention removes it
+    (tolerating Windows file locks) instead of a blocking rmtree per test.
+    """
     store_path = str(tmp_path / "test_chromadb")
     store = VectorStore(persist_directory=store_path)
     yield store
-    # Cleanup - close ChromaDB client first to release file locks
+    # Drop ChromaDB references to release file handles
     try:
         del store.collection
         del store.client
     except:
         pass
-    # Give Windows time to release file locks
-    import time
-    time.sleep(0.1)
-    # Cleanup with error handling for Windows file locks
-    if os.path.exists(store_path):
-        try:
-            shutil.rmtree(store_path)
-        except PermissionError:
-            # Windows file locking - ignore cleanup errors
-            pass
 
 
 class TestVectorStore:
@@ -249,6 +242,53 @@ class TestVectorStore:
         assert results[0].metadata.get("merchant") == "Costco"
         assert results[0].metadata.get("date") == "2026-02-11"
     
+    def test_query_with_store_filter_matches_aliases(self, temp_vector_store):
+        """Test that a store filter matches normalized spellings of the same store."""
+        store = temp_vector_store
+        
+        chunks = [
+            DocumentChunk(
+                content="Costco receipt",
+                metadata={"filename": "receipt1.jpg", "store": "Costco Wholesale"},
+                embedding=[0.5] * 384
+            ),
+            DocumentChunk(
+                content="Korean Costco receipt",
+                metadata={"filename": "receipt2.jpg", "store": "코스트코 양재점"},
+                embedding=[0.5] * 384
+            ),
+            DocumentChunk(
+                content="Walmart receipt",
+                metadata={"filename": "receipt3.jpg", "store": "Walmart"},
+                embedding=[0.5] * 384
+            )
+        ]
+        
+        store.add_chunks(chunks)
+        
+        results = store.query([0.5] * 384, top_k=5, metadata_filter={"store": "코스트코"})
+        
+        assert sorted(r.metadata["filename"] for r in results) == ["receipt1.jpg", "receipt2.jpg"]
+        assert all(r.metadata["store_norm"] == "costco" for r in results)
+    
+    def test_backfill_store_norm(self, temp_vector_store):
+        """Test that chunks stored without store_norm get it added."""
+        store = temp_vector_store
+        
+        # Simulate chunks written before store_norm existed
+        store.collection.add(
+            ids=["old-1", "old-2"],
+            embeddings=[[0.5] * 384, [0.5] * 384],
+            documents=["Costco receipt", "No store"],
+            metadatas=[{"store": "COSTCO"}, {"filename": "note.txt"}]
+        )
+        
+        assert store.backfill_store_norm(page_size=1) == 1
+        
+        results = store.query([0.5] * 384, top_k=5, metadata_filter={"store": "Costco"})
+        assert [r.chunk_id for r in results] == ["old-1"]
+        assert store.backfill_store_norm() == 0
+    
     def test_delete_by_folder(self, temp_vector_store):
         """Test deleting chunks by folder path."""
         store = temp_vector_store